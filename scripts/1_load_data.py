@@ -2,6 +2,7 @@
 import os
 import sqlite3
 import pandas as pd
+from fast_ingest import read_source
 
 # 📂 Definir caminhos do arquivo e banco de dados
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -10,7 +11,7 @@ DB_PATH = os.path.join(BASE_DIR, "../database/cyber_attacks.db")
 
 # 🔄 Colunas relevantes
 COLUMNS_TO_KEEP = [
-    "ID", "start_date", "incident_type", "receiver_country", "receiver_category", "receiver_category_subcode",
+    "ID", "name", "description", "start_date", "incident_type", "receiver_country", "receiver_category", "receiver_category_subcode",
     "MITRE_impact", "unweighted_cyber_intensity", "target_multiplier",
     "weighted_cyber_intensity", "impact_indicator", "impact_indicator_value"
 ]
@@ -24,6 +25,8 @@ def create_database():
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS cyber_incidents (
         ID INTEGER PRIMARY KEY,
+        name TEXT,
+        description TEXT,
         start_date TEXT,
         year INTEGER,
         incident_type TEXT,
@@ -45,21 +48,26 @@ def create_database():
     conn.commit()
     conn.close()
 
+# 🏷️ Criar ano e colunas limpas para categorização
+def prepare_incidents(df):
+    # 📅 Criar coluna para o ano
+    df["start_date"] = pd.to_datetime(df["start_date"], errors="coerce")
+    df["year"] = df["start_date"].dt.year
+
+    # 🏷️ Criar colunas limpas para categorização
+    df["sector_cleaned"] = df["receiver_category"].str.split(";").str[0].str.strip()
+    df["attack_type_cleaned"] = df["incident_type"].str.split(";").str[0].str.strip()
+    df["attacker_category_cleaned"] = df["receiver_category_subcode"].str.split(";").str[0].str.strip()
+    return df
+
 # 📥 Carregar e limpar os dados
 def load_data():
     print("📂 Carregando dados do arquivo CSV...")
 
     try:
-        df = pd.read_csv(DATA_PATH, usecols=COLUMNS_TO_KEEP, encoding="utf-8")
-
-        # 📅 Criar coluna para o ano
-        df["start_date"] = pd.to_datetime(df["start_date"], errors="coerce")
-        df["year"] = df["start_date"].dt.year
-
-        # 🏷️ Criar colunas limpas para categorização
-        df["sector_cleaned"] = df["receiver_category"].str.split(";").str[0].str.strip()
-        df["attack_type_cleaned"] = df["incident_type"].str.split(";").str[0].str.strip()
-        df["attacker_category_cleaned"] = df["receiver_category_subcode"].str.split(";").str[0].str.strip()
+        # Leitor Arrow multithread com esquema em cache (CSV ou XLSX)
+        df = read_source(DATA_PATH, columns=COLUMNS_TO_KEEP).to_pandas()
+        df = prepare_incidents(df)
 
         # 💾 Salvar no banco de dados
         conn = sqlite3.connect(DB_PATH)
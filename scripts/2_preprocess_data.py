@@ -1,10 +1,14 @@
+import os
 import sqlite3
+import joblib
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
+from dtype_policy import optimize_dtypes, FEATURE_DTYPE
 
 # 💂 Caminho do banco de dados
 DB_PATH = "../database/cyber_attacks.db"
 TABLE_NAME = "cyber_incidents_processed"
+SCALER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../database/standard_scaler.joblib")
 
 # 📊 Lista de países da União Europeia para filtragem
 EU_COUNTRIES = {
@@ -36,6 +40,7 @@ def load_data():
     conn = sqlite3.connect(DB_PATH)
     df = pd.read_sql("SELECT * FROM cyber_incidents", conn)
     conn.close()
+    df = optimize_dtypes(df, categorical=False, label="cyber_incidents")
     print(f"📊 {len(df)} registros carregados do banco de dados.")
     return df
 
@@ -71,13 +76,17 @@ def create_composite_attributes(df):
     print("✅ Criados atributos compostos!")
     return df
 
-# 🔄 Normalizar os valores numéricos
-def normalize_data(df):
+# 🔄 Normalizar os valores numéricos (ajusta e salva o scaler, ou reaproveita um já ajustado)
+def normalize_data(df, scaler=None):
     num_cols = ["impact_indicator_value", "unweighted_cyber_intensity", "weighted_cyber_intensity",
                 "sector_tag", "attack_type_tag", "attacker_category_tag", "impact_indicator_tag",
                 "total_attack_severity", "cyber_intensity"]
-    scaler = StandardScaler()
-    df[[col + "_norm" for col in num_cols]] = scaler.fit_transform(df[num_cols])
+    if scaler is None:
+        scaler = StandardScaler()
+        df[[col + "_norm" for col in num_cols]] = scaler.fit_transform(df[num_cols].astype(FEATURE_DTYPE))
+        joblib.dump(scaler, SCALER_PATH)
+    else:
+        df[[col + "_norm" for col in num_cols]] = scaler.transform(df[num_cols].astype(FEATURE_DTYPE))
     print("✅ Normalização concluída!")
     return df
 
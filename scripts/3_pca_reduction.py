@@ -3,54 +3,47 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
+from dtype_policy import FEATURE_DTYPE
+from streaming_moments import accumulate_parallel, correlation, pca_from_moments, CHUNK_SIZE
 
 # 📂 Caminho do banco de dados
 DB_PATH = "../database/cyber_attacks.db"
 TABLE_NAME = "cyber_incidents_processed"
 PCA_TABLE = "pca_variance"  # Nome da tabela para armazenar os resultados do PCA
-
-# 👥 Carregar dados do banco de dados
-def load_data():
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql(f"SELECT * FROM {TABLE_NAME}", conn)
-    conn.close()
-    print(f"📊 {len(df)} registros carregados do banco de dados.")
-    return df
-
-# 🔄 Selecionar apenas colunas numéricas para PCA
-def select_numeric_columns(df):
-    numeric_cols = [
-        "sector_tag_norm", "attack_type_tag_norm", "attacker_category_tag_norm",
-        "impact_indicator_tag_norm", "total_attack_severity_norm", "cyber_intensity_norm"
-    ]
-    return df[numeric_cols]
+NUMERIC_COLS = [
+    "sector_tag_norm", "attack_type_tag_norm", "attacker_category_tag_norm",
+    "impact_indicator_tag_norm", "total_attack_severity_norm", "cyber_intensity_norm"
+]
+
+# 🧮 Uma única passada (em paralelo por partições) para média e covariância
+def compute_moments():
+    moments = accumulate_parallel(TABLE_NAME, NUMERIC_COLS)
+    print(f"✅ Momentos acumulados sobre {moments['n']} registros.")
+
+    # 📏 Memória: features inteiras (float32 da política) x estado mantido pelo acumulador
+    features_kb = moments["n"] * len(NUMERIC_COLS) * np.dtype(FEATURE_DTYPE).itemsize / 1024
+    state_kb = (moments["mean"].nbytes + moments["M2"].nbytes) / 1024
+    print(f"📏 {TABLE_NAME}: {features_kb:.1f} KB de features → {state_kb:.1f} KB no acumulador "
+          f"(lidos em blocos de até {CHUNK_SIZE} linhas).")
+    return moments
 
 # 📊 Gerar o Mapa de Calor da Matriz de Correlação
-def plot_correlation_heatmap(data):
+def plot_correlation_heatmap(moments):
     plt.figure(figsize=(10, 6))
-    correlation_matrix = data.corr()
+    correlation_matrix = pd.DataFrame(correlation(moments), index=NUMERIC_COLS, columns=NUMERIC_COLS)
     sns.heatmap(correlation_matrix, annot=True, cmap="coolwarm", fmt=".2f", linewidths=0.5)
     plt.title("Mapa de Calor da Matriz de Correlação")
     plt.show()
 
-# 🔄 Aplicar PCA e calcular variância explicada
-def apply_pca(data, n_components=6):
-    scaler = StandardScaler()
-    data_scaled = scaler.fit_transform(data)
-
-    pca = PCA(n_components=n_components)
-    pca_result = pca.fit_transform(data_scaled)
-
-    explained_variance = pca.explained_variance_ratio_
-    cumulative_variance = np.cumsum(explained_variance)  # Variância acumulada
+# 🔄 PCA pela autodecomposição da matriz acumulada (mesmas razões de variância do StandardScaler + PCA)
+def apply_pca(moments, n_components=6):
+    explained_variance, cumulative_variance, _ = pca_from_moments(moments, n_components)
 
     print(f"✅ PCA aplicado! Variância explicada por componente:")
     for i, (var, cum_var) in enumerate(zip(explained_variance, cumulative_variance)):
         print(f"PC{i + 1}: {var:.4f} (Acumulada: {cum_var:.4f})")
 
-    return pca_result, explained_variance, cumulative_variance, pca
+    return explained_variance, cumulative_variance
 
 # 🔖 Salvar os resultados do PCA no banco de dados SQLite
 def save_pca_results(explained_variance, cumulative_variance):
@@ -78,17 +71,14 @@ def plot_explained_variance(explained_variance, cumulative_variance):
 
 # ✨ Executar pipeline completo
 if __name__ == "__main__":
-    print("📊 Carregando dados...")
-    df = load_data()
-
-    print("🔄 Selecionando colunas numéricas...")
-    df_numeric = select_numeric_columns(df)
+    print("🧮 Acumulando média e covariância em uma passada...")
+    moments = compute_moments()
 
     print("📊 Gerando Mapa de Calor da Matriz de Correlação...")
-    plot_correlation_heatmap(df_numeric)
+    plot_correlation_heatmap(moments)
 
     print("📈 Aplicando PCA...")
-    pca_result, explained_variance, cumulative_variance, pca = apply_pca(df_numeric)
+    explained_variance, cumulative_variance = apply_pca(moments)
 
     print("🔖 Salvando resultados do PCA no banco de dados...")
     save_pca_results(explained_variance, cumulative_variance)
@@ -1,15 +1,22 @@
+import os
 import sqlite3
+import joblib
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.cluster import KMeans
 from sklearn.decomposition import PCA
+from dtype_policy import optimize_dtypes
+from dedup_minhash import weighted_representatives
 
 # 📂 CONFIG
 DB_PATH = "../database/cyber_attacks.db"
 TABLE_NAME = "cyber_incidents_processed"
 KMEANS_TABLE = "kmeans_named_clusters"
+KMEANS_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../database/kmeans_model.joblib")
 N_CLUSTERS = 4
+# ⚖️ Treinar só nos representantes das duplicatas (dedup_minhash.py), com peso = tamanho do grupo
+USE_DEDUP_WEIGHTS = False
 
 
 # 📥 Carregar dados
@@ -17,6 +24,7 @@ def load_data():
     conn = sqlite3.connect(DB_PATH)
     df = pd.read_sql(f"SELECT * FROM {TABLE_NAME}", conn)
     conn.close()
+    df = optimize_dtypes(df, label=TABLE_NAME)
     print(f"📊 {len(df)} registros carregados.")
     return df
 
@@ -50,10 +58,14 @@ def plot_elbow_method(data, max_k=10):
     plt.show()
 
 
-# 🤖 Aplicar K-Means
-def apply_kmeans(data, n_clusters):
+# 🤖 Aplicar K-Means (opcionalmente treinando em outro conjunto, com pesos, e rotulando todos os dados)
+def apply_kmeans(data, n_clusters, fit_data=None, sample_weight=None):
     model = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-    labels = model.fit_predict(data)
+    if fit_data is None:
+        labels = model.fit_predict(data, sample_weight=sample_weight)
+    else:
+        model.fit(fit_data, sample_weight=sample_weight)
+        labels = model.predict(data)
     return labels, model
 
 
@@ -202,6 +214,16 @@ def save_results(df):
     print(f"✅ Resultados salvos na tabela '{KMEANS_TABLE}'.")
 
 
+# 💾 Salvar modelo e descrições para rotular incidentes novos (watch_folder.py)
+def save_model(model, features, descriptions):
+    joblib.dump({
+        "model": model,
+        "features": list(features.columns),
+        "descriptions": {int(k): v for k, v in descriptions.items()},
+    }, KMEANS_MODEL_PATH)
+    print(f"✅ Modelo salvo em '{KMEANS_MODEL_PATH}'.")
+
+
 # 🚀 Execução principal
 if __name__ == "__main__":
     df = load_data()
@@ -211,7 +233,12 @@ if __name__ == "__main__":
     plot_elbow_method(df_features)
 
     print("🤖 Aplicando K-Means...")
-    labels, model = apply_kmeans(df_features, N_CLUSTERS)
+    if USE_DEDUP_WEIGHTS:
+        df_reps, weights = weighted_representatives(df)
+        print(f"⚖️ Treinando em {len(df_reps)} representantes ponderados ({len(df)} incidentes).")
+        labels, model = apply_kmeans(df_features, N_CLUSTERS, fit_data=select_features(df_reps), sample_weight=weights)
+    else:
+        labels, model = apply_kmeans(df_features, N_CLUSTERS)
 
     print("🏷️ Criando descrições dos clusters...")
     df_named, cluster_descriptions = assign_cluster_descriptions(df, labels)
@@ -227,5 +254,6 @@ if __name__ == "__main__":
 
     print("💾 Salvando no banco...")
     save_results(df_named)
+    save_model(model, df_features, cluster_descriptions)
 
     print("✅ Script K-Means finalizado com sucesso!")
\ No newline at end of file
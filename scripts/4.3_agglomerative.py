@@ -4,6 +4,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import scipy.cluster.hierarchy as sch
 from sklearn.cluster import AgglomerativeClustering
+from dtype_policy import optimize_dtypes
 
 # 📂 Configurações do Banco
 DB_PATH = "../database/cyber_attacks.db"
@@ -36,6 +37,8 @@ def load_data():
     conn = sqlite3.connect(DB_PATH)
     df = pd.read_sql(f"SELECT * FROM {TABLE_NAME}", conn)
     conn.close()
+    # Sem categorias: as abreviações são concatenadas como texto
+    df = optimize_dtypes(df, categorical=False, label=TABLE_NAME)
     print(f"📊 {len(df)} registros carregados.")
     return df
 
@@ -0,0 +1,206 @@
+import os
+import re
+import time
+import sqlite3
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+# 📂 CONFIG
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "../database/cyber_attacks.db")
+EXPORT_DIR = os.path.join(BASE_DIR, "../outputs/exports")
+
+EXPORTABLE_TABLES = [
+    "cyber_incidents_processed", "kmeans_named_clusters",
+    "agglomerative_table", "model_evaluation_metrics",
+]
+BATCH_SIZE = 50_000
+MAX_WORKERS = os.cpu_count()
+COMPRESSION_LEVEL = 3
+
+# 🔣 Tipos declarados no SQLite -> tipos Arrow
+SQLITE_TO_ARROW = [
+    ("INT", pa.int64()),
+    ("REAL", pa.float64()), ("FLOA", pa.float64()), ("DOUB", pa.float64()), ("NUM", pa.float64()),
+]
+FILTER_PATTERN = re.compile(r"^\s*(\w+)\s*(>=|<=|!=|=|>|<|~)\s*(.+?)\s*$")
+EXTENSIONS = {"csv": ".csv.zst", "parquet": ".parquet"}
+
+
+# 🗂️ Esquema Arrow a partir das colunas declaradas na tabela
+def table_schema(conn, table, columns=None):
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    if table not in tables:
+        raise ValueError(f"Tabela '{table}' não existe.")
+    declared = [(r[1], (r[2] or "").upper()) for r in conn.execute(f'PRAGMA table_info("{table}")')]
+    available = dict(declared)
+    if columns:
+        unknown = [c for c in columns if c not in available]
+        if unknown:
+            raise ValueError(f"Colunas desconhecidas em '{table}': {', '.join(unknown)}")
+        declared = [(c, available[c]) for c in columns]
+
+    fields = []
+    for name, decl in declared:
+        arrow_type = next((t for key, t in SQLITE_TO_ARROW if key in decl), pa.string())
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+# 🔎 Filtros "coluna op valor" viram cláusulas parametrizadas
+def parse_filters(filters, schema):
+    clauses, params = [], []
+    for text in filters or []:
+        match = FILTER_PATTERN.match(text)
+        if not match:
+            raise ValueError(f"Filtro inválido: '{text}' (use coluna=valor, >=, <=, !=, >, < ou ~ para LIKE)")
+        column, op, value = match.groups()
+        if column not in schema.names:
+            raise ValueError(f"Coluna de filtro desconhecida: '{column}'")
+        field_type = schema.field(column).type
+        if pa.types.is_integer(field_type):
+            value = int(value)
+        elif pa.types.is_floating(field_type):
+            value = float(value)
+        if op == "~":
+            clauses.append(f'"{column}" LIKE ?')
+            value = f"%{value}%"
+        else:
+            clauses.append(f'"{column}" {op} ?')
+        params.append(value)
+    return clauses, params
+
+
+def _coerce(values, arrow_type):
+    try:
+        return pa.array(values, type=arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # SQLite não garante o tipo declarado: converte valor a valor
+        if pa.types.is_integer(arrow_type):
+            cast = int
+        elif pa.types.is_floating(arrow_type):
+            cast = float
+        else:
+            cast = str
+        return pa.array([None if v is None else cast(v) for v in values], type=arrow_type)
+
+
+# ✍️ Escritores em streaming (CSV compactado com zstd ou Parquet)
+def open_writer(path, schema, fmt):
+    if fmt == "parquet":
+        return pq.ParquetWriter(path, schema, compression="zstd", compression_level=COMPRESSION_LEVEL), None
+    sink = pa.CompressedOutputStream(path, "zstd")
+    return pv.CSVWriter(sink, schema), sink
+
+
+# 📤 Exportar uma faixa de rowid em lotes do cursor (executado em um processo)
+def export_partition(table, schema_bytes, where, params, path, fmt, batch_size, db_path=DB_PATH):
+    schema = pa.ipc.read_schema(pa.py_buffer(schema_bytes))
+    conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+    select = ", ".join(f'"{name}"' for name in schema.names)
+    where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+    cursor = conn.execute(f"SELECT {select} FROM {table}{where_sql} ORDER BY rowid", params)
+
+    writer, sink = open_writer(path, schema, fmt)
+    rows_written = 0
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            columns = list(zip(*rows))
+            batch = pa.record_batch(
+                [_coerce(list(col), field.type) for col, field in zip(columns, schema)], schema=schema
+            )
+            writer.write_batch(batch)
+            rows_written += len(rows)
+    finally:
+        writer.close()
+        if sink is not None:
+            sink.close()
+        conn.close()
+    return path, rows_written
+
+
+# 🚀 Exportar a tabela inteira em partições paralelas
+def export_table(table, fmt="csv", columns=None, filters=None, workers=MAX_WORKERS,
+                 batch_size=BATCH_SIZE, output_dir=EXPORT_DIR, db_path=DB_PATH):
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"Formato inválido: '{fmt}' (use csv ou parquet)")
+
+    conn = sqlite3.connect(db_path)
+    schema = table_schema(conn, table, columns)
+    clauses, params = parse_filters(filters, table_schema(conn, table))
+    low, high = conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {table}").fetchone()
+    conn.close()
+
+    # Remove as saídas anteriores da tabela neste formato (partições antigas viram linhas duplicadas)
+    os.makedirs(output_dir, exist_ok=True)
+    previous = re.compile(rf"{re.escape(table)}(-part-\d{{5}})?{re.escape(EXTENSIONS[fmt])}")
+    for name in os.listdir(output_dir):
+        if previous.fullmatch(name):
+            os.remove(os.path.join(output_dir, name))
+
+    schema_bytes = schema.serialize().to_pybytes()
+    if low is None:
+        low, high = 0, -1
+
+    # Faixas de rowid: cada processo escreve o seu próprio arquivo
+    workers = max(1, min(workers, high - low + 1))
+    step = (high - low + 1) / workers
+    tasks = []
+    for i in range(workers):
+        start, end = low + int(i * step), low + int((i + 1) * step)
+        suffix = f"-part-{i:05d}" if workers > 1 else ""
+        path = os.path.join(output_dir, f"{table}{suffix}{EXTENSIONS[fmt]}")
+        tasks.append((clauses + ["rowid >= ?", "rowid < ?"], params + [start, end], path))
+
+    start_time = time.perf_counter()
+    if workers == 1:
+        results = [export_partition(table, schema_bytes, w, p, path, fmt, batch_size, db_path)
+                   for w, p, path in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(export_partition, table, schema_bytes, w, p, path, fmt, batch_size, db_path)
+                       for w, p, path in tasks]
+            results = [f.result() for f in futures]
+    elapsed = time.perf_counter() - start_time
+
+    total_rows = sum(rows for _, rows in results)
+    total_bytes = sum(os.path.getsize(path) for path, _ in results)
+    print(f"✅ {table}: {total_rows} linhas em {len(results)} arquivo(s) {fmt}, "
+          f"{total_bytes / 1024 ** 2:.2f} MB em {elapsed:.2f} s.")
+    return [path for path, _ in results]
+
+
+# 🚀 Execução principal
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta tabelas de resultados em CSV zstd ou Parquet.")
+    parser.add_argument("tables", nargs="*", default=EXPORTABLE_TABLES)
+    parser.add_argument("--format", choices=sorted(EXTENSIONS), default="csv")
+    parser.add_argument("--columns", help="lista de colunas separadas por vírgula")
+    parser.add_argument("--where", action="append", help="filtro coluna<op>valor (pode repetir)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--output-dir", default=EXPORT_DIR)
+    args = parser.parse_args()
+
+    selected = args.columns.split(",") if args.columns else None
+
+    # Validar colunas e filtros em todas as tabelas antes de exportar qualquer uma
+    conn = sqlite3.connect(DB_PATH)
+    valid = []
+    for table_name in args.tables:
+        try:
+            parse_filters(args.where, table_schema(conn, table_name))
+            table_schema(conn, table_name, selected)
+            valid.append(table_name)
+        except ValueError as e:
+            print(f"⚠️ Pulando '{table_name}': {e}")
+    conn.close()
+
+    for table_name in valid:
+        export_table(table_name, args.format, selected, args.where, args.workers, args.batch_size, args.output_dir)
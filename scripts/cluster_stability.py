@@ -0,0 +1,138 @@
+import os
+import sqlite3
+import tempfile
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from threadpoolctl import threadpool_limits
+from sklearn.cluster import KMeans
+from sklearn.metrics import adjusted_rand_score
+
+# 📂 CONFIG
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "../database/cyber_attacks.db")
+KMEANS_TABLE = "kmeans_named_clusters"
+STABILITY_TABLE = "kmeans_stability"
+FEATURE_COLUMNS = [
+    "sector_tag_norm", "attack_type_tag_norm", "attacker_category_tag_norm",
+    "impact_indicator_tag_norm", "total_attack_severity_norm", "cyber_intensity_norm"
+]
+
+N_RESAMPLES = 100
+SUBSAMPLE_FRACTION = 0.8
+MAX_WORKERS = os.cpu_count()
+
+# 🚦 Faixas de estabilidade do Jaccard médio (Hennig, 2007)
+STABILITY_LEVELS = [(0.85, "Muito estável"), (0.75, "Estável"), (0.6, "Padrão fraco"), (0.0, "Instável")]
+
+
+# 📥 Carregar features e a solução de referência (K-Means salvo)
+def load_reference():
+    conn = sqlite3.connect(DB_PATH)
+    df = pd.read_sql(f"SELECT {', '.join(FEATURE_COLUMNS)}, Cluster FROM {KMEANS_TABLE}", conn)
+    conn.close()
+    df = df.dropna()
+    print(f"📊 {len(df)} registros carregados de '{KMEANS_TABLE}'.")
+    return df[FEATURE_COLUMNS].to_numpy(dtype=np.float64), df["Cluster"].to_numpy(dtype=np.int64)
+
+
+# 💾 Gravar a matriz num arquivo .npy compartilhado por memory-map
+def share_matrix(array, directory):
+    path = os.path.join(directory, "features.npy")
+    np.save(path, array)
+    return path
+
+
+# 🧮 Jaccard de cada cluster de referência com o cluster mais parecido da nova solução
+def jaccard_per_cluster(reference, labels, clusters):
+    scores = np.zeros(len(clusters))
+    new_clusters = np.unique(labels)
+    for i, c in enumerate(clusters):
+        in_ref = reference == c
+        if not in_ref.any():
+            scores[i] = np.nan
+            continue
+        best = 0.0
+        for j in new_clusters:
+            in_new = labels == j
+            union = np.logical_or(in_ref, in_new).sum()
+            best = max(best, np.logical_and(in_ref, in_new).sum() / union)
+        scores[i] = best
+    return scores
+
+
+# 🔁 Um reajuste em uma subamostra (executado em outro processo)
+def run_resample(seed, features_path, reference, n_clusters, fraction, bootstrap):
+    features = np.load(features_path, mmap_mode="r")
+    rng = np.random.default_rng(seed)
+    n = features.shape[0]
+    if bootstrap:
+        idx = np.unique(rng.integers(0, n, size=n))
+    else:
+        idx = np.sort(rng.choice(n, size=int(n * fraction), replace=False))
+
+    with threadpool_limits(limits=1):
+        model = KMeans(n_clusters=n_clusters, random_state=seed, n_init=10)
+        labels = model.fit_predict(features[idx])
+
+    ref = reference[idx]
+    clusters = np.unique(reference)
+    return adjusted_rand_score(ref, labels), jaccard_per_cluster(ref, labels, clusters)
+
+
+# 🚀 Rodar os reajustes em paralelo
+def stability_analysis(features, reference, n_resamples=N_RESAMPLES, fraction=SUBSAMPLE_FRACTION,
+                       bootstrap=False, max_workers=MAX_WORKERS):
+    n_clusters = len(np.unique(reference))
+    with tempfile.TemporaryDirectory() as tmp:
+        features_path = share_matrix(features, tmp)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(run_resample, seed, features_path, reference, n_clusters, fraction, bootstrap)
+                for seed in range(n_resamples)
+            ]
+            results = [f.result() for f in futures]
+
+    ari = np.array([r[0] for r in results])
+    jaccard = np.vstack([r[1] for r in results])
+    return ari, jaccard
+
+
+# 📋 Montar a tabela de estabilidade por cluster
+def build_stability_table(reference, jaccard):
+    rows = []
+    for i, c in enumerate(np.unique(reference)):
+        mean = np.nanmean(jaccard[:, i])
+        level = next(name for threshold, name in STABILITY_LEVELS if mean >= threshold)
+        rows.append({
+            "Cluster": int(c),
+            "Registros": int((reference == c).sum()),
+            "Jaccard Médio": round(mean, 3),
+            "Jaccard Desvio": round(np.nanstd(jaccard[:, i]), 3),
+            "Jaccard Mínimo": round(np.nanmin(jaccard[:, i]), 3),
+            "Estabilidade": level,
+        })
+    return pd.DataFrame(rows)
+
+
+# 💾 Salvar no banco
+def save_results(df_stability):
+    conn = sqlite3.connect(DB_PATH)
+    df_stability.to_sql(STABILITY_TABLE, conn, if_exists="replace", index=False)
+    conn.close()
+    print(f"✅ Resultados salvos na tabela '{STABILITY_TABLE}'.")
+
+
+# 🚀 Execução principal
+if __name__ == "__main__":
+    features, reference = load_reference()
+
+    print(f"🔁 Rodando {N_RESAMPLES} reajustes em subamostras de {SUBSAMPLE_FRACTION:.0%}...")
+    ari, jaccard = stability_analysis(features, reference)
+    print(f"✅ ARI médio com a referência: {ari.mean():.3f} (desvio {ari.std():.3f})")
+
+    df_stability = build_stability_table(reference, jaccard)
+    print("\n📋 Estabilidade por cluster:")
+    print(df_stability.to_string(index=False))
+
+    save_results(df_stability)
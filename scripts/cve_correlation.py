@@ -0,0 +1,226 @@
+import os
+import re
+import sqlite3
+
+# 📂 CONFIG
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "../database/cyber_attacks.db")
+VULN_DB_PATH = os.path.join(BASE_DIR, "../database/vulnerabilities.db")
+INCIDENTS_TABLE = "cyber_incidents"
+PROCESSED_TABLE = "cyber_incidents_processed"
+
+# 🔠 Campos de texto dos incidentes onde procuramos CVEs e produtos
+INCIDENT_TEXT_COLUMNS = ["name", "description"]
+MAX_NGRAM = 3
+BATCH_SIZE = 5000
+
+CVE_PATTERN = re.compile(r"cve-\d{4}-\d{4,}")
+WORD_PATTERN = re.compile(r"[a-z0-9]+(?:[.+][a-z0-9]+)*")
+
+
+# 🏗️ Estrutura dos índices invertidos (devolve True se o índice de CVEs precisou ser refeito)
+def create_index_tables(conn, vuln_conn):
+    columns = {row[1] for row in vuln_conn.execute("PRAGMA table_info(cve_token_index)")}
+    outdated = bool(columns) and "vendor" not in columns
+    if outdated:
+        # Índice antigo, sem o fornecedor de cada produto: reconstruir
+        vuln_conn.executescript("DROP TABLE cve_token_index; DROP TABLE IF EXISTS cve_indexed;")
+
+    vuln_conn.executescript('''
+    CREATE TABLE IF NOT EXISTS cve_token_index (token TEXT, kind TEXT, cve_id TEXT, vendor TEXT);
+    CREATE INDEX IF NOT EXISTS idx_cve_token ON cve_token_index (token, kind);
+    CREATE INDEX IF NOT EXISTS idx_cve_token_cve ON cve_token_index (cve_id);
+    CREATE TABLE IF NOT EXISTS cve_indexed (cve_id TEXT PRIMARY KEY, mod_date TEXT);
+    ''')
+    conn.executescript('''
+    CREATE TABLE IF NOT EXISTS incident_token_index (incident_id INTEGER, token TEXT);
+    CREATE INDEX IF NOT EXISTS idx_incident_token ON incident_token_index (token);
+    CREATE INDEX IF NOT EXISTS idx_incident_token_id ON incident_token_index (incident_id);
+    CREATE TABLE IF NOT EXISTS incident_indexed (incident_id INTEGER PRIMARY KEY);
+    ''')
+    return outdated
+
+
+# 🧹 Apagar os índices para reconstruir do zero
+def drop_index_tables(conn, vuln_conn):
+    vuln_conn.executescript("DROP TABLE IF EXISTS cve_token_index; DROP TABLE IF EXISTS cve_indexed;")
+    conn.executescript("DROP TABLE IF EXISTS incident_token_index; DROP TABLE IF EXISTS incident_indexed;")
+
+
+# ✂️ Tokens de um CVE: o próprio ID e o produto de cada CPE junto com o seu fornecedor
+# Produtos genéricos ("server", "mail", "cloud") só casam se o fornecedor também aparecer no texto
+def cve_tokens(cve_id, cpe):
+    tokens = {(cve_id.lower(), "cve", None)}
+    for uri in (cpe or "").split(","):
+        parts = uri.strip().split(":")
+        if len(parts) > 4 and parts[0] == "cpe":
+            vendor, product = parts[3].lower(), parts[4].lower()
+            if vendor not in ("*", "-") and product not in ("*", "-"):
+                tokens.add((product, "product", vendor))
+    return tokens
+
+
+# ✂️ Tokens de um incidente: IDs de CVE e n-gramas no formato dos produtos CPE (palavras unidas por "_")
+def incident_tokens(text):
+    text = (text or "").lower()
+    tokens = set(CVE_PATTERN.findall(text))
+    words = WORD_PATTERN.findall(text)
+    for n in range(1, MAX_NGRAM + 1):
+        for i in range(len(words) - n + 1):
+            tokens.add("_".join(words[i:i + n]))
+    return tokens
+
+
+def _insert_batches(conn, sql, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.executemany(sql, batch)
+            batch = []
+    if batch:
+        conn.executemany(sql, batch)
+
+
+# 🔄 Indexar CVEs novos ou modificados desde a última execução
+def update_cve_index(vuln_conn):
+    changed = vuln_conn.execute('''
+        SELECT v.id, v.mod_date, v.cpe
+        FROM vulnerabilities v
+        LEFT JOIN cve_indexed i ON i.cve_id = v.id
+        WHERE i.cve_id IS NULL OR i.mod_date IS NOT v.mod_date
+    ''').fetchall()
+
+    touched = set()
+    with vuln_conn:
+        vuln_conn.executemany("DELETE FROM cve_token_index WHERE cve_id = ?", [(c[0],) for c in changed])
+        rows = []
+        for cve_id, _, cpe in changed:
+            for token, kind, vendor in cve_tokens(cve_id, cpe):
+                rows.append((token, kind, cve_id, vendor))
+                touched.add(token)
+        _insert_batches(vuln_conn,
+                        "INSERT INTO cve_token_index (token, kind, cve_id, vendor) VALUES (?, ?, ?, ?)", rows)
+        vuln_conn.executemany("INSERT OR REPLACE INTO cve_indexed (cve_id, mod_date) VALUES (?, ?)",
+                              [(c[0], c[1]) for c in changed])
+
+    print(f"✅ {len(changed)} CVEs novos/modificados indexados.")
+    return touched
+
+
+# 🔄 Indexar incidentes ainda não vistos
+def update_incident_index(conn):
+    available = {row[1] for row in conn.execute(f"PRAGMA table_info({INCIDENTS_TABLE})")}
+    text_columns = [c for c in INCIDENT_TEXT_COLUMNS if c in available]
+    if not text_columns:
+        print(f"⚠️ '{INCIDENTS_TABLE}' não tem colunas de texto ({', '.join(INCIDENT_TEXT_COLUMNS)}). "
+              "Recarregue os dados com 1_load_data.py.")
+        return set()
+
+    new = conn.execute(f'''
+        SELECT t.ID, {", ".join("t." + c for c in text_columns)}
+        FROM {INCIDENTS_TABLE} t
+        LEFT JOIN incident_indexed i ON i.incident_id = t.ID
+        WHERE i.incident_id IS NULL
+    ''').fetchall()
+
+    with conn:
+        rows = (
+            (row[0], token)
+            for row in new
+            for token in incident_tokens(" ".join(str(v) for v in row[1:] if v))
+        )
+        _insert_batches(conn, "INSERT INTO incident_token_index (incident_id, token) VALUES (?, ?)", rows)
+        conn.executemany("INSERT OR IGNORE INTO incident_indexed (incident_id) VALUES (?)", [(r[0],) for r in new])
+
+    print(f"✅ {len(new)} incidentes novos indexados.")
+    return {row[0] for row in new}
+
+
+# ➕ Garantir as colunas de enriquecimento na tabela processada
+def ensure_enrichment_columns(conn):
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({PROCESSED_TABLE})")}
+    added = False
+    if "cve_count" not in columns:
+        conn.execute(f"ALTER TABLE {PROCESSED_TABLE} ADD COLUMN cve_count INTEGER DEFAULT 0")
+        added = True
+    if "max_cvss_base_score" not in columns:
+        conn.execute(f"ALTER TABLE {PROCESSED_TABLE} ADD COLUMN max_cvss_base_score REAL")
+        added = True
+    return added
+
+
+# 🔗 Recalcular o enriquecimento só dos incidentes afetados (junção indexada entre os dois bancos)
+def enrich_incidents(conn, new_incidents, touched_tokens, full=False):
+    conn.execute("ATTACH DATABASE ? AS vuln", (VULN_DB_PATH,))
+    try:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS affected (incident_id INTEGER PRIMARY KEY)")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS touched_tokens (token TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM temp.affected")
+        conn.execute("DELETE FROM temp.touched_tokens")
+
+        if full:
+            conn.execute(f"INSERT OR IGNORE INTO temp.affected SELECT ID FROM {PROCESSED_TABLE}")
+        else:
+            conn.executemany("INSERT OR IGNORE INTO temp.affected VALUES (?)", [(i,) for i in new_incidents])
+            conn.executemany("INSERT OR IGNORE INTO temp.touched_tokens VALUES (?)", [(t,) for t in touched_tokens])
+            conn.execute('''
+                INSERT OR IGNORE INTO temp.affected
+                SELECT DISTINCT i.incident_id
+                FROM temp.touched_tokens t
+                JOIN incident_token_index i ON i.token = t.token
+            ''')
+
+        # ID de CVE casa direto; produto exige o fornecedor no mesmo incidente (ou nome igual ao do produto)
+        results = conn.execute('''
+            SELECT i.incident_id, COUNT(DISTINCT c.cve_id), MAX(v.base_score)
+            FROM temp.affected a
+            JOIN incident_token_index i ON i.incident_id = a.incident_id
+            JOIN vuln.cve_token_index c ON c.token = i.token
+            JOIN vuln.vulnerabilities v ON v.id = c.cve_id
+            WHERE c.kind = 'cve' OR c.vendor = c.token OR EXISTS (
+                SELECT 1 FROM incident_token_index iv
+                WHERE iv.incident_id = i.incident_id AND iv.token = c.vendor
+            )
+            GROUP BY i.incident_id
+        ''').fetchall()
+
+        with conn:
+            conn.execute(f'''
+                UPDATE {PROCESSED_TABLE} SET cve_count = 0, max_cvss_base_score = NULL
+                WHERE ID IN (SELECT incident_id FROM temp.affected)
+            ''')
+            conn.executemany(
+                f"UPDATE {PROCESSED_TABLE} SET cve_count = ?, max_cvss_base_score = ? WHERE ID = ?",
+                [(count, score, incident_id) for incident_id, count, score in results]
+            )
+        affected = conn.execute("SELECT COUNT(*) FROM temp.affected").fetchone()[0]
+    finally:
+        conn.execute("DETACH DATABASE vuln")
+
+    print(f"✅ {affected} incidentes reavaliados, {len(results)} com CVEs relacionados.")
+    return results
+
+
+# 🚀 Atualização incremental completa
+def run(rebuild=False):
+    conn = sqlite3.connect(DB_PATH)
+    vuln_conn = sqlite3.connect(VULN_DB_PATH)
+    try:
+        if rebuild:
+            drop_index_tables(conn, vuln_conn)
+        outdated = create_index_tables(conn, vuln_conn)
+
+        touched = update_cve_index(vuln_conn)
+        new_incidents = update_incident_index(conn)
+        full = ensure_enrichment_columns(conn) or rebuild or outdated
+        return enrich_incidents(conn, new_incidents, touched, full=full)
+    finally:
+        conn.close()
+        vuln_conn.close()
+
+
+# 🚀 Execução principal
+if __name__ == "__main__":
+    print("🔗 Correlacionando incidentes com CVEs...")
+    run()
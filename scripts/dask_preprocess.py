@@ -0,0 +1,143 @@
+import os
+import io
+import sys
+import time
+import sqlite3
+import importlib
+from contextlib import redirect_stdout
+import joblib
+import numpy as np
+import pandas as pd
+import dask
+import dask.dataframe as dd
+from dask.dataframe.utils import meta_nonempty
+from sklearn.preprocessing import StandardScaler
+from dtype_policy import optimize_dtypes, FEATURE_DTYPE
+
+# 📂 CONFIG
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "../database/cyber_attacks.db")
+DB_URI = f"sqlite:///{os.path.abspath(DB_PATH)}"
+SOURCE_TABLE = "cyber_incidents"
+
+NUM_WORKERS = os.cpu_count()
+PARTITIONS_PER_WORKER = 2
+
+# ♻️ Reaproveitar as regras do pipeline pandas (2_preprocess_data.py)
+sys.path.insert(0, BASE_DIR)
+pre = importlib.import_module("2_preprocess_data")
+TABLE_NAME = pre.TABLE_NAME
+
+NUM_COLS = ["impact_indicator_value", "unweighted_cyber_intensity", "weighted_cyber_intensity",
+            "sector_tag", "attack_type_tag", "attacker_category_tag", "impact_indicator_tag",
+            "total_attack_severity", "cyber_intensity"]
+
+
+# 🧩 Etapas por partição: as mesmas funções do caminho pandas, sem os prints repetidos
+def preprocess_partition(df):
+    if df.empty:
+        # Partição vazia: roda sobre linhas fictícias (nunca da UE) só para manter colunas e tipos
+        return preprocess_partition(meta_nonempty(df)).head(0)
+    with redirect_stdout(io.StringIO()):
+        df = pre.filter_eu_countries(df.copy())
+        df = pre.create_impact_tag(df)
+        df = pre.create_tags(df)
+        df = pre.create_composite_attributes(df)
+    return df
+
+
+# 📅 Leitura particionada por faixas de ID
+def load_data(npartitions=None):
+    npartitions = npartitions or NUM_WORKERS * PARTITIONS_PER_WORKER
+    ddf = dd.read_sql_table(SOURCE_TABLE, DB_URI, index_col="ID", npartitions=npartitions)
+    print(f"📊 Tabela '{SOURCE_TABLE}' lida em {ddf.npartitions} partições.")
+    return ddf
+
+
+# 🔄 Filtro UE, tags e atributos compostos em paralelo
+def transform(ddf):
+    return ddf.map_partitions(preprocess_partition, meta=preprocess_partition(ddf._meta))
+
+
+# 🔄 Padronização global (mesma convenção do StandardScaler: desvio populacional, escala 1 se constante)
+def normalize(ddf):
+    mean, std, count = dask.compute(ddf[NUM_COLS].mean(), ddf[NUM_COLS].std(ddof=0), ddf[NUM_COLS].count())
+    scale = std.replace(0, 1.0)
+
+    def apply_scaler(part):
+        part = part.copy()
+        part[[col + "_norm" for col in NUM_COLS]] = ((part[NUM_COLS] - mean) / scale).to_numpy(dtype=FEATURE_DTYPE)
+        return part
+
+    return ddf.map_partitions(apply_scaler), build_scaler(mean, std, count)
+
+
+# 📐 StandardScaler equivalente, para o watch_folder.py escalar novos incidentes igual a este backend
+def build_scaler(mean, std, count):
+    scaler = StandardScaler()
+    scaler.mean_ = mean[NUM_COLS].to_numpy(dtype=np.float64)
+    scaler.var_ = std[NUM_COLS].to_numpy(dtype=np.float64) ** 2
+    scaler.scale_ = std[NUM_COLS].replace(0, 1.0).to_numpy(dtype=np.float64)
+    # Como o StandardScaler: contagem por coluna quando há NaN, um inteiro quando não há
+    counts = count[NUM_COLS].to_numpy(dtype=np.int64)
+    scaler.n_samples_seen_ = int(counts[0]) if (counts == counts[0]).all() else counts
+    scaler.n_features_in_ = len(NUM_COLS)
+    scaler.feature_names_in_ = np.array(NUM_COLS, dtype=object)
+    return scaler
+
+
+# ⚡ Pipeline completo no scheduler multiprocessos
+def run(npartitions=None):
+    with dask.config.set(scheduler="processes", num_workers=NUM_WORKERS):
+        ddf = transform(load_data(npartitions))
+        ddf, scaler = normalize(ddf)
+        df = ddf.compute()
+    df = df.sort_index().reset_index()
+    print(f"✅ {len(df)} registros processados com {NUM_WORKERS} processos.")
+    return df, scaler
+
+
+# 🔍 Comparar com o caminho pandas
+def verify_against_pandas(df_dask, rtol=1e-5):
+    with redirect_stdout(io.StringIO()):
+        conn = sqlite3.connect(DB_PATH)
+        df = pd.read_sql(f"SELECT * FROM {SOURCE_TABLE}", conn)
+        conn.close()
+        df = optimize_dtypes(df, categorical=False)
+        df = pre.normalize_data(pre.create_composite_attributes(pre.create_tags(
+            pre.create_impact_tag(pre.filter_eu_countries(df)))))
+    df = df.sort_values("ID").reset_index(drop=True)
+
+    # O SQLAlchemy devolve colunas TIMESTAMP como datas; o sqlite3 devolve texto
+    for col in df_dask.columns[df_dask.dtypes.map(pd.api.types.is_datetime64_any_dtype)]:
+        df[col] = pd.to_datetime(df[col])
+
+    pd.testing.assert_frame_equal(
+        df_dask[df.columns].reset_index(drop=True), df,
+        check_dtype=False, check_exact=False, rtol=rtol,
+    )
+    print("✅ Resultado idêntico ao pipeline pandas.")
+
+
+# 📂 Salvar no banco de dados
+def save_to_db(df):
+    conn = sqlite3.connect(DB_PATH)
+    df.to_sql(TABLE_NAME, conn, if_exists="replace", index=False)
+    conn.close()
+    print(f"✅ {len(df)} incidents processados e salvos!")
+
+
+# ⚡ Executar pipeline
+if __name__ == "__main__":
+    start = time.perf_counter()
+    df, scaler = run()
+    print(f"⏱️ Pré-processamento distribuído em {time.perf_counter() - start:.2f} s.")
+
+    if "--verify" in sys.argv:
+        print("🔍 Conferindo com o pipeline pandas...")
+        verify_against_pandas(df)
+
+    print("💾 Salvando os dados processados no banco...")
+    save_to_db(df)
+    joblib.dump(scaler, pre.SCALER_PATH)
+    print(f"✅ Scaler salvo em '{pre.SCALER_PATH}'.")
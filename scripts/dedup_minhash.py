@@ -0,0 +1,174 @@
+import os
+import zlib
+import sqlite3
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+from multi_hot_features import split_tokens, MULTI_VALUED_FIELDS
+
+# 📂 CONFIG
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "../database/cyber_attacks.db")
+TABLE_NAME = "cyber_incidents_processed"
+GROUPS_TABLE = "incident_duplicate_groups"
+
+# 🔠 Campos usados para comparar incidentes
+DEDUP_FIELDS = MULTI_VALUED_FIELDS + ["receiver_country"]
+
+# 🧮 MinHash + LSH: 16 bandas x 8 linhas ≈ limiar de 0.7 para virar candidato
+NUM_PERM = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.8  # Jaccard exato exigido para confirmar a duplicata
+MAX_BUCKET_PAIRS = 50  # acima disso, cada membro é comparado só com o primeiro do balde
+
+PRIME = 4294967311  # primo > 2^32
+SEED = 42
+
+
+# ✂️ Conjunto de "shingles" (campo=token) de cada incidente
+def build_shingles(df, fields=DEDUP_FIELDS):
+    shingles = []
+    for row in df[fields].itertuples(index=False, name=None):
+        shingles.append({f"{field}={token}" for field, value in zip(fields, row) for token in split_tokens(value)})
+    return shingles
+
+
+# 🔏 Assinaturas MinHash (permutações por hash universal a*x + b mod p)
+def minhash_signatures(shingles, num_perm=NUM_PERM, seed=SEED):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 31, size=num_perm, dtype=np.uint64)[:, None]
+    b = rng.integers(0, 2 ** 31, size=num_perm, dtype=np.uint64)[:, None]
+
+    signatures = np.full((len(shingles), num_perm), PRIME, dtype=np.uint64)
+    for i, items in enumerate(shingles):
+        if not items:
+            continue
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in items), dtype=np.uint64, count=len(items))
+        signatures[i] = ((a * hashes[None, :] + b) % PRIME).min(axis=1)
+    return signatures
+
+
+def jaccard(a, b):
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+# 🪣 Bandas LSH: só incidentes que caem no mesmo balde viram candidatos
+def candidate_pairs(signatures, bands=BANDS, rows=ROWS_PER_BAND):
+    pairs = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        block = signatures[:, band * rows:(band + 1) * rows]
+        for i, key in enumerate(map(bytes, block)):
+            buckets[key].append(i)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            if len(members) <= MAX_BUCKET_PAIRS:
+                pairs.update((x, y) for k, x in enumerate(members) for y in members[k + 1:])
+            else:
+                pairs.update((members[0], y) for y in members[1:])
+    return pairs
+
+
+# 🔗 Agrupar duplicatas confirmadas (union-find)
+def find_duplicate_groups(df, threshold=SIMILARITY_THRESHOLD):
+    shingles = build_shingles(df)
+    signatures = minhash_signatures(shingles)
+    valid = np.array([bool(s) for s in shingles])
+
+    parent = list(range(len(df)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    pairs = candidate_pairs(signatures)
+    confirmed = 0
+    for i, j in pairs:
+        if valid[i] and valid[j] and jaccard(shingles[i], shingles[j]) >= threshold:
+            parent[find(i)] = find(j)
+            confirmed += 1
+    print(f"🔍 {len(pairs)} pares candidatos, {confirmed} confirmados (Jaccard ≥ {threshold}).")
+
+    ids = df["ID"].to_numpy()
+    components = defaultdict(list)
+    for i in range(len(df)):
+        components[find(i)].append(i)
+
+    rows = []
+    for members in components.values():
+        if len(members) < 2:
+            continue
+        members = np.array(members)
+        rep = members[np.argmin(ids[members])]
+        for m in members:
+            rows.append({
+                "ID": int(ids[m]),
+                "group_id": int(ids[rep]),
+                "representative_ID": int(ids[rep]),
+                "group_size": len(members),
+                "jaccard_to_representative": round(jaccard(shingles[m], shingles[rep]), 3),
+            })
+
+    groups = pd.DataFrame(rows, columns=["ID", "group_id", "representative_ID", "group_size",
+                                         "jaccard_to_representative"])
+    print(f"✅ {groups['group_id'].nunique()} grupos de duplicatas com {len(groups)} incidentes.")
+    return groups
+
+
+# ⚖️ Colapsar cada grupo no representante, com peso = tamanho do grupo
+def collapse_duplicates(df, groups):
+    if groups.empty:
+        return df.copy(), np.ones(len(df))
+    dropped = set(groups.loc[groups["ID"] != groups["representative_ID"], "ID"])
+    kept = df[~df["ID"].isin(dropped)].copy()
+    weights = kept["ID"].map(groups.drop_duplicates("representative_ID")
+                             .set_index("representative_ID")["group_size"]).fillna(1)
+    return kept, weights.to_numpy(dtype=np.float64)
+
+
+# 📥 Representantes + pesos a partir da tabela salva (para o K-Means)
+def weighted_representatives(df):
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        groups = pd.read_sql(f"SELECT * FROM {GROUPS_TABLE}", conn)
+    except pd.errors.DatabaseError:
+        print(f"⚠️ Tabela '{GROUPS_TABLE}' não encontrada. Rode dedup_minhash.py antes.")
+        groups = pd.DataFrame(columns=["ID", "representative_ID", "group_size"])
+    finally:
+        conn.close()
+    return collapse_duplicates(df, groups)
+
+
+# 📥 Carregar os campos usados
+def load_data():
+    conn = sqlite3.connect(DB_PATH)
+    df = pd.read_sql(f"SELECT ID, {', '.join(DEDUP_FIELDS)} FROM {TABLE_NAME}", conn)
+    conn.close()
+    print(f"📊 {len(df)} registros carregados.")
+    return df
+
+
+# 💾 Salvar os grupos
+def save_groups(groups):
+    conn = sqlite3.connect(DB_PATH)
+    groups.to_sql(GROUPS_TABLE, conn, if_exists="replace", index=False)
+    conn.close()
+    print(f"✅ Grupos salvos na tabela '{GROUPS_TABLE}'.")
+
+
+# 🚀 Execução principal
+if __name__ == "__main__":
+    df = load_data()
+
+    print("🔏 Calculando assinaturas MinHash e bandas LSH...")
+    groups = find_duplicate_groups(df)
+
+    kept, weights = collapse_duplicates(df, groups)
+    print(f"⚖️ {len(df)} incidentes → {len(kept)} representantes (peso total {weights.sum():.0f}).")
+
+    save_groups(groups)
@@ -0,0 +1,85 @@
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+from sklearn.metrics import adjusted_rand_score, silhouette_score, davies_bouldin_score
+
+# 📂 CONFIG
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "../database/cyber_attacks.db")
+TABLE_NAME = "cyber_incidents_processed"
+
+# 🧮 Política de tipos do pipeline
+FEATURE_DTYPE = np.float32
+CATEGORICAL_COLUMNS = [
+    "sector_cleaned", "attack_type_cleaned", "attacker_category_cleaned",
+    "impact_indicator", "target_multiplier", "Cluster_Description", "data_type",
+]
+KMEANS_FEATURES = [
+    "sector_tag_norm", "attack_type_tag_norm", "attacker_category_tag_norm",
+    "impact_indicator_tag_norm", "total_attack_severity_norm", "cyber_intensity_norm"
+]
+
+# ✅ Tolerâncias aceitas em relação ao float64
+MIN_ARI = 0.99
+MAX_METRIC_DIFF = 1e-3
+
+
+# 📏 Memória ocupada pelo DataFrame (inclui strings)
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+# 🔽 Aplicar a política: float32, inteiros reduzidos e categorias
+def optimize_dtypes(df, categorical=True, label=None):
+    before = memory_mb(df)
+    df = df.copy()
+
+    for col in df.columns:
+        dtype = df[col].dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            continue
+        if pd.api.types.is_float_dtype(dtype):
+            df[col] = df[col].astype(FEATURE_DTYPE)
+        elif pd.api.types.is_integer_dtype(dtype):
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        elif categorical and col in CATEGORICAL_COLUMNS and (
+                pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)):
+            df[col] = df[col].astype("category")
+
+    if label:
+        after = memory_mb(df)
+        print(f"📏 {label}: {before:.2f} MB → {after:.2f} MB ({1 - after / max(before, 1e-9):.0%} a menos).")
+    return df
+
+
+# 🔍 Conferir que clusters e métricas em float32 ficam dentro da tolerância do float64
+def check_float32_equivalence(features, n_clusters=4):
+    features64 = np.asarray(features, dtype=np.float64)
+    features32 = features64.astype(FEATURE_DTYPE)
+
+    labels64 = KMeans(n_clusters=n_clusters, random_state=42, n_init=10).fit_predict(features64)
+    labels32 = KMeans(n_clusters=n_clusters, random_state=42, n_init=10).fit_predict(features32)
+
+    ari = adjusted_rand_score(labels64, labels32)
+    sil_diff = abs(silhouette_score(features64, labels64) - silhouette_score(features32, labels32))
+    db_diff = abs(davies_bouldin_score(features64, labels64) - davies_bouldin_score(features32, labels32))
+
+    print(f"🔍 ARI float64 x float32: {ari:.4f} | Δ silhueta: {sil_diff:.2e} | Δ Davies-Bouldin: {db_diff:.2e}")
+    ok = ari >= MIN_ARI and sil_diff <= MAX_METRIC_DIFF and db_diff <= MAX_METRIC_DIFF
+    print("✅ float32 dentro da tolerância." if ok else "❌ float32 FORA da tolerância!")
+    return ok
+
+
+# 🚀 Execução principal
+if __name__ == "__main__":
+    conn = sqlite3.connect(DB_PATH)
+    df = pd.read_sql(f"SELECT * FROM {TABLE_NAME}", conn)
+    conn.close()
+
+    df_small = optimize_dtypes(df, label=TABLE_NAME)
+    print(df_small.dtypes.astype(str).value_counts().to_string())
+
+    if not check_float32_equivalence(df[KMEANS_FEATURES].dropna()):
+        raise SystemExit(1)
@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import numpy as np
+from sklearn.metrics import silhouette_samples, davies_bouldin_score
+from scipy.spatial.distance import cdist
+
+# 📂 CONFIG
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, "../database/evaluation_cache")
+MAX_CACHE_BYTES = 512 * 1024 * 1024  # 512 MB
+
+ARRAY_FILES = ["silhouette", "clusters", "centroids", "dispersions"]
+
+
+# 🔑 Chave do cache: hash das matrizes (features, labels)
+def cache_key(features, labels):
+    digest = hashlib.sha256()
+    for arr in (np.asarray(features), np.asarray(labels)):
+        arr = np.ascontiguousarray(arr)
+        digest.update(str(arr.dtype).encode())
+        digest.update(str(arr.shape).encode())
+        digest.update(arr.tobytes())
+    return digest.hexdigest()
+
+
+# 🧮 Calcular todas as métricas de avaliação de uma vez
+def compute_evaluation(features, labels):
+    features = np.asarray(features)
+    labels = np.asarray(labels)
+    clusters = np.unique(labels)
+    centroids = np.array([features[labels == k].mean(axis=0) for k in clusters])
+    dispersions = np.array([
+        np.mean(cdist(features[labels == k], [centroids[i]], "euclidean"))
+        for i, k in enumerate(clusters)
+    ])
+    silhouette_vals = silhouette_samples(features, labels)
+
+    return {
+        "silhouette": silhouette_vals,
+        "clusters": clusters,
+        "centroids": centroids,
+        "dispersions": dispersions,
+        "silhouette_score": float(silhouette_vals.mean()),
+        "davies_bouldin": float(davies_bouldin_score(features, labels)),
+    }
+
+
+# 💾 Gravar uma entrada (escrita atômica via diretório temporário)
+def _store(key, result):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    final_dir = os.path.join(CACHE_DIR, key)
+    tmp_dir = f"{final_dir}.tmp-{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    for name in ARRAY_FILES:
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), result[name])
+    with open(os.path.join(tmp_dir, "metrics.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "silhouette_score": result["silhouette_score"],
+            "davies_bouldin": result["davies_bouldin"],
+        }, f)
+
+    try:
+        os.rename(tmp_dir, final_dir)
+    except OSError:
+        # Outro processo gravou a mesma chave primeiro
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+# 📂 Ler uma entrada com memory-map (None se não existir)
+def _load(key):
+    entry_dir = os.path.join(CACHE_DIR, key)
+    metrics_path = os.path.join(entry_dir, "metrics.json")
+    if not os.path.exists(metrics_path):
+        return None
+
+    with open(metrics_path, encoding="utf-8") as f:
+        result = json.load(f)
+    for name in ARRAY_FILES:
+        result[name] = np.load(os.path.join(entry_dir, f"{name}.npy"), mmap_mode="r")
+
+    # Marca o acesso para a política LRU
+    os.utime(entry_dir)
+    return result
+
+
+def _dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+# 🧹 Remover as entradas menos usadas até caber no limite de tamanho
+def evict(max_bytes=MAX_CACHE_BYTES):
+    if not os.path.isdir(CACHE_DIR):
+        return
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if os.path.isdir(path) and ".tmp-" not in name:
+            entries.append((os.path.getmtime(path), _dir_size(path), path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+# ⚡ Avaliar usando o cache quando a atribuição de clusters não mudou
+def evaluate(features, labels, use_cache=True):
+    if not use_cache:
+        return compute_evaluation(features, labels)
+
+    start = time.perf_counter()
+    key = cache_key(features, labels)
+    result = _load(key)
+    if result is not None:
+        print(f"⚡ Avaliação obtida do cache ({(time.perf_counter() - start) * 1000:.1f} ms).")
+        return result
+
+    result = compute_evaluation(features, labels)
+    _store(key, result)
+    evict()
+    print(f"🧮 Avaliação calculada e armazenada no cache ({time.perf_counter() - start:.2f} s).")
+    return result
+
+
+# 🧹 Limpar o cache inteiro
+def clear_cache():
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    print("✅ Cache de avaliação removido.")
+
+
+if __name__ == "__main__":
+    clear_cache()
@@ -0,0 +1,188 @@
+import os
+import csv
+import json
+import hashlib
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+# 📂 CONFIG
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, "../database/ingest_cache")
+SCHEMA_PATH = os.path.join(BASE_DIR, "../database/eurepoc_schema.json")
+MANIFEST_PATH = os.path.join(CACHE_DIR, "manifest.json")
+
+BLOCK_SIZE = 16 * 1024 * 1024  # bytes por bloco lido em paralelo
+# As descrições do EuRepoC têm quebras de linha dentro de aspas
+NEWLINES_IN_VALUES = True
+HASH_CHUNK = 4 * 1024 * 1024
+# Mesmos marcadores de nulo do pd.read_csv: célula vazia vira NaN, não ''
+NULL_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+# Sobe quando a conversão muda, para invalidar os Parquet já em cache
+CACHE_VERSION = 2
+
+
+# 🔍 Detectar o formato pelos primeiros bytes (não pela extensão)
+def detect_format(path):
+    with open(path, "rb") as f:
+        magic = f.read(4)
+    if magic == b"PK\x03\x04":
+        return "xlsx"
+    if magic == b"PAR1":
+        return "parquet"
+    return "csv"
+
+
+# 🔑 Impressão digital do arquivo (mtime, tamanho e hash)
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_json(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_json(data, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+
+
+# 📋 Ler o cabeçalho sem o BOM do arquivo exportado
+def read_header(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return next(csv.reader(f))
+
+
+# 🗂️ Esquema das colunas de origem, inferido uma vez e reaproveitado
+def load_schema():
+    cached = _load_json(SCHEMA_PATH)
+    return {name: pa.type_for_alias(alias) for name, alias in cached.items()}
+
+
+def infer_schema(path):
+    print("🔎 Inferindo o esquema das colunas...")
+    table = _read_csv(path, column_types={}, columns=None)
+    schema = {}
+    for field in table.schema:
+        # Colunas vazias viram texto para não quebrar em exportações futuras
+        if pa.types.is_null(field.type):
+            schema[field.name] = "string"
+        elif pa.types.is_date32(field.type):
+            schema[field.name] = "date32"
+        else:
+            schema[field.name] = str(field.type)
+    _save_json(schema, SCHEMA_PATH)
+    print(f"✅ Esquema com {len(schema)} colunas salvo em '{SCHEMA_PATH}'.")
+    return load_schema()
+
+
+def _read_csv(path, column_types, columns):
+    header = read_header(path)
+    return pv.read_csv(
+        path,
+        read_options=pv.ReadOptions(use_threads=True, block_size=BLOCK_SIZE, column_names=header, skip_rows=1),
+        parse_options=pv.ParseOptions(newlines_in_values=NEWLINES_IN_VALUES),
+        convert_options=pv.ConvertOptions(column_types=column_types, include_columns=columns,
+                                          null_values=NULL_VALUES, strings_can_be_null=True),
+    )
+
+
+# ⚡ Ler CSV com o leitor multithread do Arrow e tipos explícitos
+def read_csv_arrow(path, columns=None):
+    schema = load_schema()
+    if not schema or not set(read_header(path)) <= set(schema):
+        return _read_csv(path, infer_schema(path), columns)
+    try:
+        return _read_csv(path, schema, columns)
+    except pa.ArrowInvalid as e:
+        # Uma coluna mudou de tipo na nova exportação (ex.: inteiros com nulos viram "3.0")
+        print(f"⚠️ Esquema em cache não serve mais ({e}); inferindo de novo.")
+        return _read_csv(path, infer_schema(path), columns)
+
+
+# 📄 Converter a planilha para CSV em modo streaming (read-only)
+def xlsx_to_csv(xlsx_path, csv_path):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            for row in sheet.iter_rows(values_only=True):
+                writer.writerow(["" if v is None else v for v in row])
+    finally:
+        workbook.close()
+
+
+# 💾 Converter uma vez e reaproveitar enquanto o arquivo não mudar
+def cached_parquet(path):
+    source = os.path.abspath(path)
+    stat = os.stat(source)
+    manifest = _load_json(MANIFEST_PATH)
+    entry = manifest.get(source)
+    current = entry is not None and entry.get("version") == CACHE_VERSION
+
+    if current and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size \
+            and os.path.exists(entry["parquet"]):
+        return entry["parquet"]
+
+    # mtime mudou: o hash decide se o conteúdo realmente mudou
+    sha = file_hash(source)
+    if current and entry["sha256"] == sha and os.path.exists(entry["parquet"]):
+        entry.update(mtime=stat.st_mtime, size=stat.st_size)
+        _save_json(manifest, MANIFEST_PATH)
+        return entry["parquet"]
+
+    print(f"🔄 Convertendo '{os.path.basename(path)}' para CSV/Parquet (uma única vez)...")
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    csv_path = os.path.join(CACHE_DIR, f"{stem}-{sha[:16]}.csv")
+    parquet_path = os.path.join(CACHE_DIR, f"{stem}-{sha[:16]}.parquet")
+
+    xlsx_to_csv(source, csv_path)
+    pq.write_table(read_csv_arrow(csv_path), parquet_path, compression="zstd")
+
+    if entry and entry["parquet"] != parquet_path:
+        for old in (entry["parquet"], entry.get("csv")):
+            if old and os.path.exists(old):
+                os.remove(old)
+    manifest[source] = {
+        "mtime": stat.st_mtime, "size": stat.st_size, "sha256": sha, "version": CACHE_VERSION,
+        "csv": csv_path, "parquet": parquet_path,
+    }
+    _save_json(manifest, MANIFEST_PATH)
+    print(f"✅ Cache salvo em '{parquet_path}'.")
+    return parquet_path
+
+
+# 📥 Ponto de entrada: qualquer formato vira uma tabela Arrow
+def read_source(path, columns=None):
+    fmt = detect_format(path)
+    if fmt == "xlsx":
+        return pq.read_table(cached_parquet(path), columns=columns)
+    if fmt == "parquet":
+        return pq.read_table(path, columns=columns)
+    return read_csv_arrow(path, columns=columns)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    for source_path in sys.argv[1:]:
+        start = time.perf_counter()
+        table = read_source(source_path)
+        print(f"✅ {source_path}: {table.num_rows} linhas x {table.num_columns} colunas "
+              f"em {time.perf_counter() - start:.2f} s.")
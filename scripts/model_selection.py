@@ -0,0 +1,205 @@
+import os
+import sqlite3
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from threadpoolctl import threadpool_limits
+from sklearn.cluster import KMeans, MiniBatchKMeans, AgglomerativeClustering, Birch
+from evaluation_cache import compute_evaluation
+
+# 📂 CONFIG
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "../database/cyber_attacks.db")
+TABLE_NAME = "cyber_incidents_processed"
+# Tabela própria: "model_evaluation_metrics" é a do resultado.py (lida pelo /metrics)
+LEADERBOARD_TABLE = "model_selection_leaderboard"
+
+# 🔢 Grade de busca
+ALGORITHMS = [
+    "kmeans", "minibatch_kmeans", "kmedoids",
+    "agglomerative_ward", "agglomerative_complete", "agglomerative_average",
+    "birch",
+]
+K_VALUES = list(range(2, 11))
+FEATURE_SUBSETS = {
+    "completo": [
+        "sector_tag_norm", "attack_type_tag_norm", "attacker_category_tag_norm",
+        "impact_indicator_tag_norm", "total_attack_severity_norm", "cyber_intensity_norm"
+    ],
+    "severidade_intensidade": ["total_attack_severity_norm", "cyber_intensity_norm"],
+    "categorias": ["sector_tag_norm", "attack_type_tag_norm", "attacker_category_tag_norm"],
+}
+
+# ⏱️ Controles de orçamento
+MAX_WORKERS = os.cpu_count()
+MAX_WALL_TIME = 600  # segundos para a grade inteira
+PATIENCE = 3  # valores de k seguidos sem melhora antes de parar o grupo
+GRACE_PERIOD = 30  # segundos extras para os grupos terminarem o ajuste em andamento
+
+
+# 📥 Carregar apenas as colunas usadas em alguma combinação
+def load_data():
+    columns = sorted({c for cols in FEATURE_SUBSETS.values() for c in cols})
+    conn = sqlite3.connect(DB_PATH)
+    df = pd.read_sql(f"SELECT {', '.join(columns)} FROM {TABLE_NAME}", conn)
+    conn.close()
+    print(f"📊 {len(df)} registros carregados.")
+    return df.dropna()
+
+
+# 🤖 Criar o modelo para um algoritmo e um k
+def make_model(algorithm, k):
+    if algorithm == "kmeans":
+        return KMeans(n_clusters=k, random_state=42, n_init=10)
+    if algorithm == "minibatch_kmeans":
+        return MiniBatchKMeans(n_clusters=k, random_state=42, n_init=3, batch_size=1024)
+    if algorithm == "kmedoids":
+        from sklearn_extra.cluster import KMedoids
+        return KMedoids(n_clusters=k, random_state=42)
+    if algorithm.startswith("agglomerative_"):
+        return AgglomerativeClustering(n_clusters=k, linkage=algorithm.split("_", 1)[1])
+    if algorithm == "birch":
+        return Birch(n_clusters=k)
+    raise ValueError(f"Algoritmo desconhecido: {algorithm}")
+
+
+# 🔍 Verificar se as dependências opcionais estão instaladas
+def available_algorithms(algorithms):
+    selected = []
+    for algorithm in algorithms:
+        if algorithm == "kmedoids":
+            try:
+                import sklearn_extra  # noqa: F401
+            except ImportError:
+                print("⚠️ scikit-learn-extra não instalado, pulando KMedoids.")
+                continue
+        selected.append(algorithm)
+    return selected
+
+
+# 🧪 Avaliar um grupo (algoritmo + atributos) variando k, com parada antecipada
+# No prazo final o grupo devolve os k já avaliados em vez de descartá-los
+def run_group(algorithm, subset_name, features, k_values, deadline, patience):
+    results = []
+    best = -np.inf
+    without_improvement = 0
+
+    with threadpool_limits(limits=1):
+        for k in k_values:
+            if time.time() >= deadline:
+                break
+            if k >= len(features):
+                break
+
+            start = time.perf_counter()
+            labels = make_model(algorithm, k).fit_predict(features)
+            fit_time = time.perf_counter() - start
+            if len(np.unique(labels)) < 2:
+                continue
+
+            # Sem o cache em disco: cada ponto da grade é único e os workers não disputam o LRU do resultado.py
+            metrics = compute_evaluation(features, labels)
+            silhouette = metrics["silhouette_score"]
+            results.append({
+                "Algoritmo": algorithm,
+                "k": k,
+                "Atributos": subset_name,
+                "Coeficiente de Silhouette": round(silhouette, 3),
+                "Índice Davies-Bouldin": round(metrics["davies_bouldin"], 3),
+                "Tempo (s)": round(fit_time, 3),
+            })
+
+            if silhouette > best:
+                best = silhouette
+                without_improvement = 0
+            else:
+                without_improvement += 1
+                if without_improvement >= patience:
+                    break
+
+    return results
+
+
+# 🛑 Encerrar processos ainda ocupados com um ajuste (shutdown sozinho não interrompe)
+def stop_workers(executor):
+    if hasattr(executor, "terminate_workers"):  # Python 3.14+
+        executor.terminate_workers()
+        return
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
+# 🚀 Rodar a grade em paralelo respeitando o tempo máximo
+def run_grid(df, algorithms=ALGORITHMS, k_values=K_VALUES, feature_subsets=FEATURE_SUBSETS,
+             max_workers=MAX_WORKERS, max_wall_time=MAX_WALL_TIME, patience=PATIENCE,
+             grace_period=GRACE_PERIOD):
+    deadline = time.time() + max_wall_time
+    results = []
+
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    pending = set()
+    try:
+        for algorithm in available_algorithms(algorithms):
+            for subset_name, columns in feature_subsets.items():
+                features = df[columns].to_numpy(dtype=np.float64)
+                pending.add(executor.submit(
+                    run_group, algorithm, subset_name, features, k_values, deadline, patience
+                ))
+
+        # Depois do prazo, os grupos param no próximo k e devolvem o que já avaliaram
+        while pending:
+            remaining = deadline + grace_period - time.time()
+            if remaining <= 0:
+                print(f"⏱️ Tempo máximo atingido, {len(pending)} grupos interrompidos no meio de um ajuste.")
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    results.extend(future.result())
+                except Exception as e:
+                    print(f"❌ ERRO em um grupo da grade: {e}")
+    finally:
+        if pending:
+            stop_workers(executor)
+        else:
+            executor.shutdown(wait=True)
+
+    return results
+
+
+# 🏆 Ordenar os resultados (maior silhueta, menor Davies-Bouldin)
+def build_leaderboard(results):
+    leaderboard = pd.DataFrame(results)
+    if leaderboard.empty:
+        return leaderboard
+    leaderboard = leaderboard.sort_values(
+        ["Coeficiente de Silhouette", "Índice Davies-Bouldin"], ascending=[False, True]
+    ).reset_index(drop=True)
+    leaderboard.insert(0, "Posição", range(1, len(leaderboard) + 1))
+    return leaderboard
+
+
+# 💾 Salvar o ranking no banco
+def save_leaderboard(leaderboard):
+    conn = sqlite3.connect(DB_PATH)
+    leaderboard.to_sql(LEADERBOARD_TABLE, conn, if_exists="replace", index=False)
+    conn.close()
+    print(f"✅ Ranking salvo na tabela '{LEADERBOARD_TABLE}'.")
+
+
+# 🚀 Execução principal
+if __name__ == "__main__":
+    df = load_data()
+
+    print(f"🤖 Rodando grade de modelos com até {MAX_WORKERS} processos...")
+    start = time.time()
+    results = run_grid(df)
+    print(f"✅ {len(results)} combinações avaliadas em {time.time() - start:.1f} s.")
+
+    leaderboard = build_leaderboard(results)
+    print("\n🏆 Melhores modelos:")
+    print(leaderboard.head(10).to_string(index=False))
+
+    save_leaderboard(leaderboard)
@@ -0,0 +1,148 @@
+import os
+import re
+import json
+import sqlite3
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.cluster import KMeans
+from sklearn.decomposition import TruncatedSVD
+
+# 📂 CONFIG
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "../database/cyber_attacks.db")
+VOCAB_PATH = os.path.join(BASE_DIR, "../database/multi_hot_vocabulary.json")
+MATRIX_PATH = os.path.join(BASE_DIR, "../database/multi_hot_features.npz")
+TABLE_NAME = "cyber_incidents_processed"
+CLUSTERS_TABLE = "multi_hot_clusters"
+
+# 🔠 Campos com vários valores separados por ";" ou " - "
+MULTI_VALUED_FIELDS = ["receiver_category", "receiver_category_subcode", "MITRE_impact", "incident_type"]
+NUMERIC_FEATURES = ["total_attack_severity_norm", "cyber_intensity_norm"]
+TOKEN_SEPARATOR = re.compile(r";\s*|\s+-\s+")
+
+N_CLUSTERS = 4
+SVD_COMPONENTS = 10  # None para agrupar direto na matriz esparsa
+MIN_COUNT = 1
+
+
+# ✂️ Separar um valor multivalorado em tokens únicos (mantendo a ordem)
+def split_tokens(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return []
+    tokens = (t.strip() for t in TOKEN_SEPARATOR.split(str(value)))
+    return list(dict.fromkeys(t for t in tokens if t and t.lower() not in {"none", "nan"}))
+
+
+# 📥 Carregar os campos necessários
+def load_data():
+    columns = ["ID"] + MULTI_VALUED_FIELDS + NUMERIC_FEATURES
+    conn = sqlite3.connect(DB_PATH)
+    df = pd.read_sql(f"SELECT {', '.join(columns)} FROM {TABLE_NAME}", conn)
+    conn.close()
+    print(f"📊 {len(df)} registros carregados.")
+    return df
+
+
+# 📚 Construir o vocabulário (campo=token -> coluna)
+# Partindo de um vocabulário salvo, as colunas existentes são mantidas e termos novos vão para o fim
+def build_vocabulary(df, fields=MULTI_VALUED_FIELDS, min_count=MIN_COUNT, vocabulary=None):
+    vocabulary = dict(vocabulary or {})
+    known = len(vocabulary)
+    for field in fields:
+        counts = {}
+        for value in df[field]:
+            for token in split_tokens(value):
+                counts[token] = counts.get(token, 0) + 1
+        for token in sorted(t for t, n in counts.items() if n >= min_count):
+            vocabulary.setdefault(f"{field}={token}", len(vocabulary))
+    print(f"✅ Vocabulário com {len(vocabulary)} termos ({len(vocabulary) - known} novos).")
+    return vocabulary
+
+
+# 💾 Persistir / carregar o vocabulário
+def save_vocabulary(vocabulary, path=VOCAB_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(vocabulary, f, ensure_ascii=False, indent=1)
+
+
+def load_vocabulary(path=VOCAB_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# 🧮 Gerar a matriz multi-hot CSR sem passar por uma matriz densa
+def transform(df, vocabulary, fields=MULTI_VALUED_FIELDS):
+    indptr = [0]
+    indices = []
+    values = df[fields].itertuples(index=False, name=None)
+    for row in values:
+        cols = set()
+        for field, value in zip(fields, row):
+            for token in split_tokens(value):
+                col = vocabulary.get(f"{field}={token}")
+                if col is not None:
+                    cols.add(col)
+        indices.extend(sorted(cols))
+        indptr.append(len(indices))
+
+    indices = np.asarray(indices, dtype=np.int32)
+    data = np.ones(len(indices), dtype=np.float32)
+    return sp.csr_matrix((data, indices, np.asarray(indptr, dtype=np.int64)),
+                         shape=(len(df), len(vocabulary)))
+
+
+# ➕ Acrescentar colunas numéricas normalizadas à matriz esparsa
+def combine_with_numeric(matrix, df, columns=NUMERIC_FEATURES):
+    numeric = sp.csr_matrix(df[columns].fillna(0).to_numpy(dtype=np.float32))
+    return sp.hstack([matrix, numeric], format="csr")
+
+
+# 📏 Comparar memória esparsa x densa
+def report_memory(matrix):
+    sparse_bytes = matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    dense_bytes = matrix.shape[0] * matrix.shape[1] * matrix.dtype.itemsize
+    print(f"📏 Matriz {matrix.shape[0]}x{matrix.shape[1]}, {matrix.nnz} não-zeros: "
+          f"{sparse_bytes / 1024:.1f} KB esparsa vs {dense_bytes / 1024:.1f} KB densa.")
+
+
+# 🤖 Agrupar direto na CSR ou após TruncatedSVD
+def cluster_sparse(matrix, n_clusters=N_CLUSTERS, n_components=SVD_COMPONENTS):
+    data = matrix
+    if n_components is not None:
+        n_components = min(n_components, matrix.shape[1] - 1)
+        svd = TruncatedSVD(n_components=n_components, random_state=42)
+        data = svd.fit_transform(matrix)
+        print(f"✅ TruncatedSVD: {svd.explained_variance_ratio_.sum():.3f} da variância em {n_components} componentes.")
+    model = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+    labels = model.fit_predict(data)
+    return labels, model
+
+
+# 💾 Salvar matriz e clusters
+def save_results(matrix, df, labels):
+    sp.save_npz(MATRIX_PATH, matrix)
+    conn = sqlite3.connect(DB_PATH)
+    pd.DataFrame({"ID": df["ID"], "Cluster": labels}).to_sql(CLUSTERS_TABLE, conn, if_exists="replace", index=False)
+    conn.close()
+    print(f"✅ Matriz salva em '{MATRIX_PATH}' e clusters na tabela '{CLUSTERS_TABLE}'.")
+
+
+# 🚀 Execução principal
+if __name__ == "__main__":
+    df = load_data()
+
+    print("📚 Construindo vocabulário dos campos multivalorados...")
+    vocabulary = build_vocabulary(df, vocabulary=load_vocabulary())
+    save_vocabulary(vocabulary)
+
+    print("🧮 Gerando matriz multi-hot...")
+    matrix = combine_with_numeric(transform(df, vocabulary), df)
+    report_memory(matrix)
+
+    print("🤖 Aplicando K-Means...")
+    labels, model = cluster_sparse(matrix)
+
+    save_results(matrix, df, labels)
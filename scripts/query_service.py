@@ -0,0 +1,291 @@
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import argparse
+import statistics
+from collections import OrderedDict, deque
+from urllib.parse import urlsplit, parse_qs
+
+# 📂 CONFIG
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "../database/cyber_attacks.db")
+HOST = "127.0.0.1"
+PORT = 8050
+
+POOL_SIZE = 8
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+CACHE_MAX_ENTRIES = 2048
+LATENCY_WINDOW = 10000
+
+# 🔗 Endpoints: tabela, colunas padrão (enxutas) e filtros aceitos (parâmetro -> coluna, operador)
+ENDPOINTS = {
+    "/kmeans": {
+        "table": "kmeans_named_clusters",
+        "columns": ["ID", "year", "receiver_country", "sector_cleaned", "attack_type_cleaned",
+                    "attacker_category_cleaned", "impact_indicator_value", "Cluster", "Cluster_Description"],
+        "filters": {"cluster": ("Cluster", "="), "sector": ("sector_cleaned", "="),
+                    "country": ("receiver_country", "like"), "year": ("year", "=")},
+    },
+    "/agglomerative": {
+        "table": "agglomerative_table",
+        "columns": ["cluster_key", "data_type", "Cluster", "total_attack_severity_norm", "cyber_intensity_norm"],
+        "filters": {"cluster": ("Cluster", "="), "type": ("data_type", "="), "key": ("cluster_key", "=")},
+    },
+    "/metrics": {
+        "table": "model_evaluation_metrics",
+        "columns": None,
+        "filters": {},
+    },
+}
+
+# 📇 Índices úteis para os filtros mais comuns (criados com --create-indexes)
+INDEXES = {
+    "kmeans_named_clusters": ["Cluster", "sector_cleaned", "year"],
+    "agglomerative_table": ["Cluster", "data_type"],
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# 🔌 Conjunto de conexões somente leitura
+def open_readonly(db_path=DB_PATH):
+    conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def create_indexes(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path)
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    with conn:
+        for table, columns in INDEXES.items():
+            if table not in tables:
+                continue
+            for column in columns:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_{column}" ON {table} ("{column}")')
+    conn.close()
+    print("✅ Índices de consulta criados.")
+
+
+# 🧠 Estado do serviço: pool, cache LRU e latências
+def new_state(db_path=DB_PATH, pool_size=POOL_SIZE):
+    pool = asyncio.Queue()
+    for _ in range(pool_size):
+        pool.put_nowait(open_readonly(db_path))
+    watcher = open_readonly(db_path)
+    return {
+        "pool": pool,
+        "watcher": watcher,
+        "data_version": watcher.execute("PRAGMA data_version").fetchone()[0],
+        "cache": OrderedDict(),
+        "columns": {},
+        "latencies": deque(maxlen=LATENCY_WINDOW),
+        "hits": 0,
+        "misses": 0,
+        "invalidations": 0,
+    }
+
+
+# 🔄 Limpar o cache quando outro processo (o pipeline) fizer commit no banco
+def check_invalidation(state):
+    version = state["watcher"].execute("PRAGMA data_version").fetchone()[0]
+    if version != state["data_version"]:
+        state["data_version"] = version
+        state["cache"].clear()
+        state["columns"].clear()
+        state["invalidations"] += 1
+
+
+def _table_columns(conn, state, table):
+    if table not in state["columns"]:
+        state["columns"][table] = [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+    return state["columns"][table]
+
+
+def _parse_int(params, name, default, minimum=1, maximum=None):
+    try:
+        value = int(params.get(name, [default])[0])
+    except ValueError:
+        raise HTTPError(400, f"Parâmetro '{name}' deve ser inteiro.")
+    value = max(value, minimum)
+    return min(value, maximum) if maximum else value
+
+
+# 🔎 Montar e executar a consulta paginada (roda numa thread do executor)
+def run_query(conn, state, endpoint, params):
+    spec = ENDPOINTS[endpoint]
+    table = spec["table"]
+    available = _table_columns(conn, state, table)
+    if not available:
+        raise HTTPError(404, f"Tabela '{table}' não existe.")
+
+    if "columns" in params:
+        columns = [c for c in params["columns"][0].split(",") if c]
+        unknown = set(columns) - set(available)
+        if unknown:
+            raise HTTPError(400, f"Colunas desconhecidas: {', '.join(sorted(unknown))}")
+    else:
+        columns = [c for c in (spec["columns"] or available) if c in available]
+
+    where, args = [], []
+    for name, (column, op) in spec["filters"].items():
+        if name in params and column in available:
+            if op == "like":
+                where.append(f'"{column}" LIKE ?')
+                args.append(f"%{params[name][0]}%")
+            else:
+                where.append(f'"{column}" = ?')
+                args.append(params[name][0])
+    where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+
+    page = _parse_int(params, "page", 1)
+    page_size = _parse_int(params, "page_size", DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE)
+    select = ", ".join(f'"{c}"' for c in columns)
+
+    total = conn.execute(f"SELECT COUNT(*) FROM {table}{where_sql}", args).fetchone()[0]
+    rows = conn.execute(
+        f"SELECT {select} FROM {table}{where_sql} ORDER BY rowid LIMIT ? OFFSET ?",
+        args + [page_size, (page - 1) * page_size],
+    ).fetchall()
+
+    return {
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "rows": [dict(r) for r in rows],
+    }
+
+
+# 📊 Latência p50/p99 e uso do cache
+def stats(state):
+    latencies = list(state["latencies"])
+    result = {
+        "requests": len(latencies),
+        "cache_hits": state["hits"],
+        "cache_misses": state["misses"],
+        "cache_entries": len(state["cache"]),
+        "invalidations": state["invalidations"],
+    }
+    if len(latencies) >= 2:
+        q = statistics.quantiles(latencies, n=100)
+        result.update(p50_ms=round(q[49], 3), p99_ms=round(q[98], 3))
+    return result
+
+
+# ⚡ Atender uma requisição GET (cache -> pool de conexões)
+async def handle_get(state, target):
+    url = urlsplit(target)
+    if url.path == "/stats":
+        return stats(state)
+    if url.path == "/health":
+        return {"status": "ok"}
+    if url.path not in ENDPOINTS:
+        raise HTTPError(404, f"Endpoint '{url.path}' não existe.")
+
+    check_invalidation(state)
+    params = parse_qs(url.query)
+    key = (url.path, tuple(sorted((k, tuple(v)) for k, v in params.items())))
+    cache = state["cache"]
+    if key in cache:
+        cache.move_to_end(key)
+        state["hits"] += 1
+        return cache[key]
+
+    state["misses"] += 1
+    conn = await state["pool"].get()
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, run_query, conn, state, url.path, params)
+    finally:
+        state["pool"].put_nowait(conn)
+
+    cache[key] = result
+    if len(cache) > CACHE_MAX_ENTRIES:
+        cache.popitem(last=False)
+    return result
+
+
+def _response(status, body, keep_alive):
+    reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+              500: "Internal Server Error"}.get(status, "OK")
+    payload = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+    headers = (
+        f"HTTP/1.1 {status} {reason}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return headers.encode("latin-1") + payload
+
+
+# 🔁 Conexão HTTP/1.1 (com keep-alive)
+async def handle_connection(state, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            start = time.perf_counter()
+            keep_alive = headers.get("connection", "").lower() != "close"
+            try:
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                if method != "GET":
+                    raise HTTPError(405, "Apenas GET é suportado.")
+                status, body = 200, await handle_get(state, target)
+            except HTTPError as e:
+                status, body = e.status, {"error": e.message}
+            except ValueError:
+                status, body = 400, {"error": "Requisição malformada."}
+            except sqlite3.Error as e:
+                status, body = 500, {"error": str(e)}
+
+            writer.write(_response(status, body, keep_alive))
+            await writer.drain()
+            state["latencies"].append((time.perf_counter() - start) * 1000)
+            if not keep_alive:
+                break
+    except (ConnectionResetError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host=HOST, port=PORT, db_path=DB_PATH, pool_size=POOL_SIZE):
+    state = new_state(db_path, pool_size)
+    server = await asyncio.start_server(lambda r, w: handle_connection(state, r, w), host, port)
+    print(f"🚀 Serviço de consulta em http://{host}:{port} (endpoints: {', '.join(ENDPOINTS)}, /stats)")
+    async with server:
+        await server.serve_forever()
+
+
+# 🚀 Execução principal
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço HTTP de consulta aos resultados dos clusters.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE)
+    parser.add_argument("--create-indexes", action="store_true", help="cria índices para os filtros antes de subir")
+    args = parser.parse_args()
+
+    if args.create_indexes:
+        create_indexes()
+    try:
+        asyncio.run(serve(args.host, args.port, pool_size=args.pool_size))
+    except KeyboardInterrupt:
+        print("\n🛑 Serviço encerrado.")
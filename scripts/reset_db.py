@@ -3,7 +3,37 @@ import sqlite3
 
 # Diretório base do projeto
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(BASE_DIR, "../database/cyber_attack.db")
+DB_PATH = os.path.join(BASE_DIR, "../database/vulnerabilities.db")
+
+# Estrutura da tabela de vulnerabilidades (compartilhada com o carregador de CVEs)
+VULNERABILITIES_COLUMNS = [
+    "id", "pub_date", "mod_date", "description", "cwe", "reference_links", "cpe",
+    "base_score", "base_severity", "attack_vector", "attack_complexity",
+    "privileges_required", "user_interaction", "scope",
+    "impact_confidentiality", "impact_integrity", "impact_availability"
+]
+
+VULNERABILITIES_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS vulnerabilities (
+    id TEXT PRIMARY KEY,
+    pub_date TEXT,
+    mod_date TEXT,
+    description TEXT,
+    cwe TEXT,
+    reference_links TEXT,
+    cpe TEXT,
+    base_score FLOAT,
+    base_severity TEXT,
+    attack_vector TEXT,
+    attack_complexity TEXT,
+    privileges_required TEXT,
+    user_interaction TEXT,
+    scope TEXT,
+    impact_confidentiality TEXT,
+    impact_integrity TEXT,
+    impact_availability TEXT
+)
+'''
 
 
 def reset_database():
@@ -20,26 +50,7 @@ def reset_database():
     cursor = conn.cursor()
 
     # Criar tabela corretamente com todas as colunas necessárias
-    cursor.execute('''
-    CREATE TABLE vulnerabilities (
-        id TEXT PRIMARY KEY,
-        pub_date TEXT,
-        mod_date TEXT,
-        description TEXT,
-        cwe TEXT,
-        reference_links TEXT,  
-        base_score FLOAT,
-        base_severity TEXT,
-        attack_vector TEXT,
-        attack_complexity TEXT,
-        privileges_required TEXT,
-        user_interaction TEXT,
-        scope TEXT,
-        impact_confidentiality TEXT,
-        impact_integrity TEXT,
-        impact_availability TEXT
-    )
-    ''')
+    cursor.execute(VULNERABILITIES_SCHEMA)
 
     conn.commit()
     conn.close()
@@ -2,29 +2,50 @@ import sqlite3
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.metrics import silhouette_score, davies_bouldin_score, silhouette_samples
+from sklearn.metrics import silhouette_samples
 from scipy.spatial.distance import cdist
+from evaluation_cache import evaluate
+from dtype_policy import optimize_dtypes
 
 # 📂 Configurações
 DB_PATH = "../database/cyber_attacks.db"
 TABLE_KMEANS = "kmeans_named_clusters"
 TABLE_AGGLO = "agglomerative_table"
+FEATURE_COLUMNS = ["total_attack_severity_norm", "cyber_intensity_norm"]
 
-# 🎯 Carregar dados pré-processados
-def load_data(table_name):
+# 🎯 Carregar dados pré-processados (apenas as colunas necessárias)
+def load_data(table_name, columns=None):
     conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql(f"SELECT * FROM {table_name}", conn)
+    select = ", ".join(f'"{c}"' for c in columns) if columns else "*"
+    df = pd.read_sql(f"SELECT {select} FROM {table_name}", conn)
     conn.close()
+    df = optimize_dtypes(df, label=table_name)
     print(f"✅ Dados carregados: {table_name} ({len(df)} registros)")
     return df
 
 # 🔢 Selecionar features
 def select_features(df):
-    return df[["total_attack_severity_norm", "cyber_intensity_norm"]]
+    return df[FEATURE_COLUMNS]
+
+# 🏷️ Nomes dos clusters derivados dos próprios dados (acompanham mudanças de k)
+def build_cluster_names(df, name_column, max_items=3):
+    names = {}
+    for c, group in df.groupby("Cluster"):
+        values = group[name_column].dropna().astype(str).value_counts().index.tolist()
+        if not values:
+            names[c] = f"Grupo {c + 1}"
+            continue
+        extra = len(values) - max_items
+        name = ", ".join(values[:max_items]) + (f" (+{extra})" if extra > 0 else "")
+        names[c] = f"Grupo {c + 1}: {name}"
+    return names
 
 # 📊 Gráfico da Silhueta com nomes personalizados
-def plot_silhouette(data, labels, cluster_names, title):
-    silhouette_vals = silhouette_samples(data, labels)
+def plot_silhouette(data, labels, cluster_names, title, silhouette_vals=None):
+    if silhouette_vals is None:
+        silhouette_vals = silhouette_samples(data, labels)
+    else:
+        silhouette_vals = np.asarray(silhouette_vals)
     y_lower = 10
     plt.figure(figsize=(10, 6))
 
@@ -47,11 +68,9 @@ def plot_silhouette(data, labels, cluster_names, title):
     plt.tight_layout()
     plt.show()
 
-# 📊 Avaliar clusters existentes
+# 📊 Avaliar clusters existentes (reaproveita o cache se os clusters não mudaram)
 def evaluate_existing_clusters(features, labels):
-    silhouette = silhouette_score(features, labels)
-    davies = davies_bouldin_score(features, labels)
-    return silhouette, davies
+    return evaluate(np.asarray(features), np.asarray(labels))
 
 # 📋 Mostrar tabela de resultados (imagem)
 def plot_scores_table(scores_df):
@@ -81,13 +100,19 @@ def save_evaluation_results(scores_df):
     conn.close()
 
 # 📋 Tabela detalhada Davies-Bouldin
-def detailed_davies_bouldin(features, labels, cluster_names):
-    clusters = np.unique(labels)
-    centroids = np.array([features[labels == k].mean(axis=0) for k in clusters])
-    dispersions = np.array([
-        np.mean(cdist(features[labels == k], [centroids[i]], 'euclidean'))
-        for i, k in enumerate(clusters)
-    ])
+def detailed_davies_bouldin(features, labels, cluster_names, stats=None):
+    if stats is not None:
+        # Centróides e dispersões já calculados (cache de avaliação)
+        clusters = np.asarray(stats["clusters"])
+        centroids = np.asarray(stats["centroids"])
+        dispersions = np.asarray(stats["dispersions"])
+    else:
+        clusters = np.unique(labels)
+        centroids = np.array([features[labels == k].mean(axis=0) for k in clusters])
+        dispersions = np.array([
+            np.mean(cdist(features[labels == k], [centroids[i]], 'euclidean'))
+            for i, k in enumerate(clusters)
+        ])
 
     db_table = []
     for i, cluster_i in enumerate(clusters):
@@ -133,8 +158,8 @@ def print_detailed_db_table(df_db, label):
 # 🚀 Execução principal
 if __name__ == "__main__":
     # Carregar dados existentes
-    df_kmeans = load_data(TABLE_KMEANS)
-    df_agglo = load_data(TABLE_AGGLO)
+    df_kmeans = load_data(TABLE_KMEANS, FEATURE_COLUMNS + ["Cluster", "Cluster_Description"])
+    df_agglo = load_data(TABLE_AGGLO, FEATURE_COLUMNS + ["Cluster", "cluster_key"])
 
     # Selecionar features e labels
     features_kmeans = select_features(df_kmeans)
@@ -144,8 +169,10 @@ if __name__ == "__main__":
     labels_agglo = df_agglo["Cluster"]
 
     # Avaliar numericamente
-    k_silhouette, k_davies = evaluate_existing_clusters(features_kmeans, labels_kmeans)
-    a_silhouette, a_davies = evaluate_existing_clusters(features_agglo, labels_agglo)
+    kmeans_eval = evaluate_existing_clusters(features_kmeans.values, labels_kmeans.values)
+    agglo_eval = evaluate_existing_clusters(features_agglo.values, labels_agglo.values)
+    k_silhouette, k_davies = kmeans_eval["silhouette_score"], kmeans_eval["davies_bouldin"]
+    a_silhouette, a_davies = agglo_eval["silhouette_score"], agglo_eval["davies_bouldin"]
 
     # Resultados em tabela
     scores_df = pd.DataFrame({
@@ -154,24 +181,15 @@ if __name__ == "__main__":
         "Índice Davies-Bouldin": [round(k_davies, 3), round(a_davies, 3)]
     })
 
-    # Nomes dos clusters
-    kmeans_cluster_names = {
-        0: "Baixa Severidade",
-        1: "Média Severidade",
-        2: "Alta Severidade",
-        3: "Crítico"
-    }
-
-    agglo_cluster_names = {
-        0: "Europa Central e Mídia",
-        1: "Infraestrutura Crítica",
-        2: "Governos e Energia",
-        3: "Militar e Financeiro"
-    }
+    # Nomes dos clusters (gerados a partir das tabelas para não ficarem desatualizados quando k muda)
+    kmeans_cluster_names = build_cluster_names(df_kmeans, "Cluster_Description", max_items=1)
+    agglo_cluster_names = build_cluster_names(df_agglo, "cluster_key")
 
     # Gráficos da Silhueta
-    plot_silhouette(features_kmeans.values, labels_kmeans, kmeans_cluster_names, "Silhueta - K-Means")
-    plot_silhouette(features_agglo.values, labels_agglo, agglo_cluster_names, "Silhueta - Agglomerative Clustering")
+    plot_silhouette(features_kmeans.values, labels_kmeans, kmeans_cluster_names, "Silhueta - K-Means",
+                    silhouette_vals=kmeans_eval["silhouette"])
+    plot_silhouette(features_agglo.values, labels_agglo, agglo_cluster_names, "Silhueta - Agglomerative Clustering",
+                    silhouette_vals=agglo_eval["silhouette"])
 
     # Mostrar tabelas
     plot_scores_table(scores_df)
@@ -182,10 +200,12 @@ if __name__ == "__main__":
     print("✅ Avaliação concluída e resultados salvos no banco de dados.")
 
     # ➕ Tabelas detalhadas Davies-Bouldin
-    kmeans_db_table = detailed_davies_bouldin(features_kmeans.values, labels_kmeans.values, kmeans_cluster_names)
+    kmeans_db_table = detailed_davies_bouldin(features_kmeans.values, labels_kmeans.values, kmeans_cluster_names,
+                                              stats=kmeans_eval)
     plot_detailed_db_table(kmeans_db_table, "Resultado Detalhada Davies-Bouldin (K-Means)")
     print_detailed_db_table(kmeans_db_table, "Resultado Detalhada Davies-Bouldin (K-Means)")
 
-    agglo_db_table = detailed_davies_bouldin(features_agglo.values, labels_agglo.values, agglo_cluster_names)
+    agglo_db_table = detailed_davies_bouldin(features_agglo.values, labels_agglo.values, agglo_cluster_names,
+                                             stats=agglo_eval)
     plot_detailed_db_table(agglo_db_table, "Resultado Detalhada Davies-Bouldin (Agglomerative Clustering)")
     print_detailed_db_table(agglo_db_table, "Resultado Detalhada Davies-Bouldin (Agglomerative Clustering)")
\ No newline at end of file
@@ -0,0 +1,240 @@
+import os
+import sqlite3
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree, BallTree
+
+# 📂 CONFIG
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "../database/cyber_attacks.db")
+INDEX_PATH = os.path.join(BASE_DIR, "../database/similarity_index.joblib")
+TABLE_NAME = "cyber_incidents_processed"
+KMEANS_TABLE = "kmeans_named_clusters"
+
+# 🔢 Espaços de atributos disponíveis para o índice
+FEATURE_SPACES = {
+    "norm": (TABLE_NAME, [
+        "sector_tag_norm", "attack_type_tag_norm", "attacker_category_tag_norm",
+        "impact_indicator_tag_norm", "total_attack_severity_norm", "cyber_intensity_norm"
+    ]),
+    "pca": (KMEANS_TABLE, ["PCA1", "PCA2", "PCA3"]),
+}
+
+# 🧮 Acima desta dimensão a BallTree costuma superar a KDTree
+KDTREE_MAX_DIM = 10
+# 🔁 Quantidade de vetores pendentes antes de reconstruir a árvore
+REBUILD_THRESHOLD = 500
+LEAF_SIZE = 40
+
+
+# 🌳 Backends de busca: cada um sabe construir, adicionar e consultar
+def _build_tree(tree_cls):
+    def build(vectors):
+        return tree_cls(vectors, leaf_size=LEAF_SIZE)
+    return build
+
+
+def _query_tree(tree, vectors, k):
+    k = min(k, tree.data.shape[0])
+    return tree.query(vectors, k=k)
+
+
+def _build_hnsw(vectors):
+    try:
+        import hnswlib
+    except ImportError:
+        raise ImportError("O backend 'hnsw' requer o pacote opcional 'hnswlib' (pip install hnswlib).")
+    index = hnswlib.Index(space="l2", dim=vectors.shape[1])
+    index.init_index(max_elements=max(len(vectors), 1) * 2, ef_construction=200, M=16)
+    index.add_items(vectors, np.arange(len(vectors)))
+    index.set_ef(64)
+    return index
+
+
+def _add_hnsw(index, vectors, start):
+    needed = start + len(vectors)
+    if needed > index.get_max_elements():
+        index.resize_index(needed * 2)
+    index.add_items(vectors, np.arange(start, needed))
+    return index
+
+
+def _query_hnsw(index, vectors, k):
+    k = min(k, index.get_current_count())
+    labels, sq_dist = index.knn_query(vectors, k=k)
+    return np.sqrt(sq_dist), labels.astype(np.int64)
+
+
+BACKENDS = {
+    "kdtree": {"build": _build_tree(KDTree), "query": _query_tree, "add": None},
+    "balltree": {"build": _build_tree(BallTree), "query": _query_tree, "add": None},
+    "hnsw": {"build": _build_hnsw, "query": _query_hnsw, "add": _add_hnsw},
+}
+
+
+# 📥 Carregar vetores de atributos (ID + colunas do espaço escolhido)
+def load_vectors(space="norm"):
+    table, columns = FEATURE_SPACES[space]
+    conn = sqlite3.connect(DB_PATH)
+    df = pd.read_sql(f"SELECT ID, {', '.join(columns)} FROM {table}", conn)
+    conn.close()
+    df = df.dropna(subset=columns)
+    return df["ID"].to_numpy(dtype=np.int64), df[columns].to_numpy(dtype=np.float64)
+
+
+# 🧭 Escolher o backend exato conforme a dimensão
+def choose_backend(n_dims):
+    return "kdtree" if n_dims <= KDTREE_MAX_DIM else "balltree"
+
+
+# 🏗️ Construir o índice do zero
+def build_index(space="norm", backend=None):
+    ids, vectors = load_vectors(space)
+    backend = backend or choose_backend(vectors.shape[1])
+    index = {
+        "space": space,
+        "backend": backend,
+        "ids": ids,
+        "vectors": vectors,
+        "structure": BACKENDS[backend]["build"](vectors),
+        "pending_ids": np.empty(0, dtype=np.int64),
+        "pending_vectors": np.empty((0, vectors.shape[1])),
+        "positions": _build_positions(ids),
+    }
+    print(f"✅ Índice '{backend}' construído com {len(ids)} incidentes ({space}).")
+    return index
+
+
+# 🗺️ ID -> posição na ordem [ids, pending_ids] (a reconstrução da árvore preserva essa ordem)
+def _build_positions(ids):
+    positions = {}
+    for pos, incident_id in enumerate(ids.tolist()):
+        positions.setdefault(incident_id, pos)
+    return positions
+
+
+def _positions(index):
+    if "positions" not in index:  # índices salvos antes do mapa existir
+        index["positions"] = _build_positions(np.concatenate([index["ids"], index["pending_ids"]]))
+    return index["positions"]
+
+
+# ➕ Adicionar incidentes novos sem reconstruir tudo
+def add_to_index(index, new_ids, new_vectors):
+    known = np.concatenate([index["ids"], index["pending_ids"]])
+    mask = ~np.isin(new_ids, known)
+    new_ids, new_vectors = new_ids[mask], new_vectors[mask]
+    if len(new_ids) == 0:
+        return index
+    positions = _positions(index)
+    for pos, incident_id in enumerate(new_ids.tolist(), start=len(known)):
+        positions.setdefault(incident_id, pos)
+
+    backend = BACKENDS[index["backend"]]
+    if backend["add"] is not None:
+        # Backends aproximados aceitam inserção direta
+        index["structure"] = backend["add"](index["structure"], new_vectors, len(index["ids"]))
+        index["ids"] = np.concatenate([index["ids"], new_ids])
+        index["vectors"] = np.vstack([index["vectors"], new_vectors])
+        return index
+
+    # Árvores são estáticas: novos vetores ficam num buffer consultado por força bruta
+    index["pending_ids"] = np.concatenate([index["pending_ids"], new_ids])
+    index["pending_vectors"] = np.vstack([index["pending_vectors"], new_vectors])
+    if len(index["pending_ids"]) >= REBUILD_THRESHOLD:
+        index["ids"] = np.concatenate([index["ids"], index["pending_ids"]])
+        index["vectors"] = np.vstack([index["vectors"], index["pending_vectors"]])
+        index["structure"] = backend["build"](index["vectors"])
+        index["pending_ids"] = np.empty(0, dtype=np.int64)
+        index["pending_vectors"] = np.empty((0, index["vectors"].shape[1]))
+        print(f"🔁 Índice reconstruído com {len(index['ids'])} incidentes.")
+    return index
+
+
+# 🔎 Os vetores já indexados continuam iguais aos da tabela? (scaler refeito, tabela recriada...)
+def index_is_stale(index, ids, vectors):
+    known_ids = np.concatenate([index["ids"], index["pending_ids"]])
+    known_vectors = np.vstack([index["vectors"], index["pending_vectors"]])
+    order = np.argsort(ids)
+    pos = np.searchsorted(ids, known_ids, sorter=order)
+    pos = order[np.minimum(pos, len(ids) - 1)] if len(ids) else pos
+    if len(ids) == 0 or not np.array_equal(ids[pos], known_ids):
+        return True
+    return not np.allclose(vectors[pos], known_vectors)
+
+
+# 🔄 Atualizar o índice: reconstrói se a tabela mudou, senão só adiciona os IDs ainda não indexados
+def update_index(index):
+    ids, vectors = load_vectors(index["space"])
+    if index_is_stale(index, ids, vectors):
+        print("🔁 Vetores de origem mudaram (scaler ou tabela refeitos); reconstruindo o índice...")
+        return build_index(index["space"], index["backend"])
+
+    before = len(index["ids"]) + len(index["pending_ids"])
+    index = add_to_index(index, ids, vectors)
+    added = len(index["ids"]) + len(index["pending_ids"]) - before
+    print(f"✅ {added} incidentes novos adicionados ao índice.")
+    return index
+
+
+# 🔍 Consultar os k incidentes mais parecidos
+def query_index(index, vectors, k=5):
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float64))
+    dist, pos = BACKENDS[index["backend"]]["query"](index["structure"], vectors, k)
+    ids = index["ids"][pos]
+
+    if len(index["pending_ids"]):
+        diff = vectors[:, None, :] - index["pending_vectors"][None, :, :]
+        pending_dist = np.sqrt((diff ** 2).sum(axis=2))
+        dist = np.hstack([dist, pending_dist])
+        ids = np.hstack([ids, np.broadcast_to(index["pending_ids"], pending_dist.shape)])
+        order = np.argsort(dist, axis=1)[:, :k]
+        dist = np.take_along_axis(dist, order, axis=1)
+        ids = np.take_along_axis(ids, order, axis=1)
+
+    return ids, dist
+
+
+# 🔍 Consultar vizinhos de um incidente já indexado
+def query_by_id(index, incident_id, k=5):
+    pos = _positions(index).get(int(incident_id))
+    if pos is None:
+        raise KeyError(f"Incidente {incident_id} não está no índice.")
+    n_main = len(index["ids"])
+    vector = index["vectors"][pos] if pos < n_main else index["pending_vectors"][pos - n_main]
+    ids, dist = query_index(index, vector, k=k + 1)
+    keep = ids[0] != incident_id
+    return ids[0][keep][:k], dist[0][keep][:k]
+
+
+# 💾 Persistir e recarregar o índice
+def save_index(index, path=INDEX_PATH):
+    joblib.dump(index, path)
+    print(f"✅ Índice salvo em '{path}'.")
+
+
+def load_index(path=INDEX_PATH):
+    return joblib.load(path)
+
+
+# 🚀 Execução principal
+if __name__ == "__main__":
+    if os.path.exists(INDEX_PATH):
+        print("📂 Carregando índice existente...")
+        index = update_index(load_index())
+    else:
+        print("🏗️ Construindo índice de similaridade...")
+        index = build_index(space="norm")
+
+    save_index(index)
+
+    sample_id = int(index["ids"][0])
+    start = time.perf_counter()
+    neighbor_ids, distances = query_by_id(index, sample_id, k=5)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n🔍 Incidentes mais parecidos com o ID {sample_id} ({elapsed_ms:.3f} ms):")
+    for nid, d in zip(neighbor_ids, distances):
+        print(f"- ID {nid}: distância {d:.4f}")
@@ -0,0 +1,171 @@
+import sys
+import gzip
+import time
+import sqlite3
+import ijson
+from reset_db import DB_PATH, VULNERABILITIES_COLUMNS, VULNERABILITIES_SCHEMA
+
+# 📂 CONFIG
+BATCH_SIZE = 5000
+
+# 🔎 Prefixos ijson dos formatos de feed da NVD
+FEED_PREFIXES = {
+    "1.1": "CVE_Items.item",         # feeds anuais nvdcve-1.1-AAAA.json(.gz)
+    "2.0": "vulnerabilities.item",   # respostas/feeds da API 2.0
+}
+
+INSERT_SQL = (
+    f"INSERT OR REPLACE INTO vulnerabilities ({', '.join(VULNERABILITIES_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in VULNERABILITIES_COLUMNS)})"
+)
+
+
+# 📂 Abrir o arquivo (compactado ou não) em modo binário
+def open_feed(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+# 🔍 Descobrir o formato do feed lendo só o início do arquivo
+def detect_format(path):
+    with open_feed(path) as f:
+        head = f.read(65536)
+    if b'"CVE_Items"' in head:
+        return "1.1"
+    if b'"vulnerabilities"' in head:
+        return "2.0"
+    raise ValueError(f"Formato de feed NVD não reconhecido: {path}")
+
+
+# 🔗 Coletar CPEs dos nós de configuração (inclusive nós filhos)
+def _collect_cpes(nodes, match_key, uri_key):
+    cpes = []
+    for node in nodes or []:
+        cpes.extend(m[uri_key] for m in node.get(match_key, []) if uri_key in m)
+        cpes.extend(_collect_cpes(node.get("children", []), match_key, uri_key))
+    return cpes
+
+
+def _cvss_row(cvss):
+    return (
+        cvss.get("baseScore"),
+        cvss.get("baseSeverity", "N/A"),
+        cvss.get("attackVector"),
+        cvss.get("attackComplexity"),
+        cvss.get("privilegesRequired"),
+        cvss.get("userInteraction"),
+        cvss.get("scope"),
+        cvss.get("confidentialityImpact"),
+        cvss.get("integrityImpact"),
+        cvss.get("availabilityImpact"),
+    )
+
+
+# 🧾 Achatar um item do feed 1.1 na ordem de VULNERABILITIES_COLUMNS
+def flatten_cve_v11(item):
+    cve = item.get("cve", {})
+    cwe = cve.get("problemtype", {}).get("problemtype_data", [{}])[0].get("description", [{}])
+    description = cve.get("description", {}).get("description_data", [{}])
+    references = ", ".join(ref["url"] for ref in cve.get("references", {}).get("reference_data", []))
+    cpe = ", ".join(_collect_cpes(item.get("configurations", {}).get("nodes", []), "cpe_match", "cpe23Uri"))
+    cvss = item.get("impact", {}).get("baseMetricV3", {}).get("cvssV3", {})
+
+    return (
+        cve["CVE_data_meta"]["ID"],
+        item.get("publishedDate", "N/A"),
+        item.get("lastModifiedDate", "N/A"),
+        description[0].get("value", "N/A") if description else "N/A",
+        cwe[0].get("value", "N/A") if cwe else "N/A",
+        references,
+        cpe,
+    ) + _cvss_row(cvss)
+
+
+# 🧾 Achatar um item do feed/API 2.0 na mesma ordem
+def flatten_cve_v20(item):
+    cve = item.get("cve", item)
+    description = next((d["value"] for d in cve.get("descriptions", []) if d.get("lang") == "en"), "N/A")
+    cwe = next((d["value"] for w in cve.get("weaknesses", []) for d in w.get("description", [])), "N/A")
+    references = ", ".join(ref["url"] for ref in cve.get("references", []))
+    nodes = [n for conf in cve.get("configurations", []) for n in conf.get("nodes", [])]
+    cpe = ", ".join(_collect_cpes(nodes, "cpeMatch", "criteria"))
+    metrics = cve.get("metrics", {})
+    v3 = metrics.get("cvssMetricV31") or metrics.get("cvssMetricV30") or [{}]
+    cvss = dict(v3[0].get("cvssData", {}))
+    cvss.setdefault("baseSeverity", v3[0].get("baseSeverity", "N/A"))
+
+    return (
+        cve["id"],
+        cve.get("published", "N/A"),
+        cve.get("lastModified", "N/A"),
+        description,
+        cwe,
+        references,
+        cpe,
+    ) + _cvss_row(cvss)
+
+
+FLATTENERS = {"1.1": flatten_cve_v11, "2.0": flatten_cve_v20}
+
+
+# 🌊 Iterar os CVEs do arquivo um a um, sem carregar o feed inteiro
+def iter_cves(path, feed_format=None):
+    feed_format = feed_format or detect_format(path)
+    flatten = FLATTENERS[feed_format]
+    with open_feed(path) as f:
+        for item in ijson.items(f, FEED_PREFIXES[feed_format], use_float=True):
+            yield flatten(item)
+
+
+# 💾 Gravar linhas em lotes (um executemany + commit por lote)
+def write_batches(conn, rows, batch_size=BATCH_SIZE):
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            with conn:
+                conn.executemany(INSERT_SQL, batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        with conn:
+            conn.executemany(INSERT_SQL, batch)
+        total += len(batch)
+    return total
+
+
+# 🔌 Conexão ajustada para carga em massa
+def connect(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(VULNERABILITIES_SCHEMA)
+    return conn
+
+
+# 📥 Carregar um ou mais feeds
+def load_feeds(paths, db_path=DB_PATH, batch_size=BATCH_SIZE):
+    conn = connect(db_path)
+    grand_total = 0
+    try:
+        for path in paths:
+            start = time.perf_counter()
+            print(f"📂 Lendo {path}...")
+            total = write_batches(conn, iter_cves(path), batch_size)
+            elapsed = time.perf_counter() - start
+            print(f"✅ {total} CVEs gravados em {elapsed:.1f} s ({total / max(elapsed, 1e-9):.0f} CVEs/s).")
+            grand_total += total
+    finally:
+        conn.close()
+    return grand_total
+
+
+# 🚀 Execução principal
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python stream_cve_loader.py <nvdcve-1.1-AAAA.json[.gz]> [...]")
+        sys.exit(1)
+    load_feeds(sys.argv[1:])
@@ -0,0 +1,111 @@
+import os
+import sqlite3
+from functools import reduce
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# 📂 CONFIG
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "../database/cyber_attacks.db")
+CHUNK_SIZE = 100_000
+MAX_WORKERS = os.cpu_count()
+
+
+# 🧮 Estado acumulado: contagem, média e soma dos produtos dos desvios (M2)
+def new_moments(n_features):
+    return {
+        "n": 0,
+        "mean": np.zeros(n_features),
+        "M2": np.zeros((n_features, n_features)),
+    }
+
+
+# 🔗 Combinar dois estados (fórmula de Chan et al.)
+def merge_moments(a, b):
+    if a["n"] == 0:
+        return b
+    if b["n"] == 0:
+        return a
+    n = a["n"] + b["n"]
+    delta = b["mean"] - a["mean"]
+    return {
+        "n": n,
+        "mean": a["mean"] + delta * (b["n"] / n),
+        "M2": a["M2"] + b["M2"] + np.outer(delta, delta) * (a["n"] * b["n"] / n),
+    }
+
+
+# ➕ Acrescentar um bloco de linhas ao estado
+def update_moments(state, chunk):
+    chunk = np.asarray(chunk, dtype=np.float64)
+    chunk = chunk[~np.isnan(chunk).any(axis=1)]
+    if len(chunk) == 0:
+        return state
+    mean = chunk.mean(axis=0)
+    centered = chunk - mean
+    return merge_moments(state, {"n": len(chunk), "mean": mean, "M2": centered.T @ centered})
+
+
+# 📊 Derivados do estado
+def covariance(state, ddof=1):
+    return state["M2"] / (state["n"] - ddof)
+
+
+def correlation(state):
+    std = np.sqrt(np.diag(state["M2"]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return state["M2"] / np.outer(std, std)
+
+
+# 📊 Covariância dos dados padronizados (como StandardScaler: coluna constante vira zero)
+def standardized_covariance(state):
+    std = np.sqrt(np.diag(covariance(state, ddof=0)))
+    scale = np.where(std == 0, 1.0, std)
+    return covariance(state, ddof=1) / np.outer(scale, scale)
+
+
+# 📈 PCA por autodecomposição da matriz acumulada
+def pca_from_moments(state, n_components=None):
+    eigenvalues, eigenvectors = np.linalg.eigh(standardized_covariance(state))
+    order = np.argsort(eigenvalues)[::-1]
+    eigenvalues = np.clip(eigenvalues[order], 0, None)
+    eigenvectors = eigenvectors[:, order]
+
+    n_components = n_components or len(eigenvalues)
+    explained_variance = eigenvalues[:n_components] / eigenvalues.sum()
+    return explained_variance, np.cumsum(explained_variance), eigenvectors[:, :n_components].T
+
+
+# 📥 Uma única passada em blocos sobre a tabela
+def accumulate_from_db(table, columns, chunksize=CHUNK_SIZE, where=None, params=()):
+    query = f"SELECT {', '.join(columns)} FROM {table}"
+    if where:
+        query += f" WHERE {where}"
+    state = new_moments(len(columns))
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        for chunk in pd.read_sql(query, conn, params=params, chunksize=chunksize):
+            state = update_moments(state, chunk.to_numpy(dtype=np.float64))
+    finally:
+        conn.close()
+    return state
+
+
+# ⚡ Várias partições (faixas de rowid) em paralelo, combinadas no final
+def accumulate_parallel(table, columns, n_partitions=MAX_WORKERS, chunksize=CHUNK_SIZE):
+    conn = sqlite3.connect(DB_PATH)
+    low, high = conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {table}").fetchone()
+    conn.close()
+    if low is None:
+        return new_moments(len(columns))
+
+    bounds = np.linspace(low, high + 1, n_partitions + 1).astype(int)
+    with ProcessPoolExecutor(max_workers=n_partitions) as executor:
+        futures = [
+            executor.submit(accumulate_from_db, table, columns, chunksize,
+                            "rowid >= ? AND rowid < ?", (int(start), int(end)))
+            for start, end in zip(bounds[:-1], bounds[1:]) if end > start
+        ]
+        states = [f.result() for f in futures]
+    return reduce(merge_moments, states, new_moments(len(columns)))
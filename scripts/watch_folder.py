@@ -0,0 +1,292 @@
+import os
+import io
+import csv
+import sys
+import hashlib
+import glob
+import time
+import sqlite3
+import argparse
+import importlib
+from datetime import datetime
+import joblib
+import pandas as pd
+
+# 📂 CONFIG
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WATCH_DIR = os.path.join(BASE_DIR, "../data")
+DB_PATH = os.path.join(BASE_DIR, "../database/cyber_attacks.db")
+FILE_PATTERN = "*.csv"
+POLL_INTERVAL = 2.0  # segundos
+IDLE_TIMEOUT = 60.0  # segundos sem alteração para aceitar um último registro sem quebra de linha
+FINGERPRINT_BYTES = 64 * 1024  # início do arquivo usado para perceber que ele foi substituído
+
+RAW_TABLE = "cyber_incidents"
+PROCESSED_TABLE = "cyber_incidents_processed"
+KMEANS_TABLE = "kmeans_named_clusters"
+OFFSETS_TABLE = "ingest_offsets"
+LOG_TABLE = "micro_batch_log"
+
+# ♻️ Mesmas regras das etapas 1, 2 e 4.1 do pipeline
+sys.path.insert(0, BASE_DIR)
+loader = importlib.import_module("1_load_data")
+pre = importlib.import_module("2_preprocess_data")
+KMEANS_MODEL_PATH = os.path.join(BASE_DIR, "../database/kmeans_model.joblib")
+
+
+# 🏗️ Tabelas de controle (offset por arquivo e log de latência)
+def create_control_tables(conn):
+    conn.executescript(f'''
+    CREATE TABLE IF NOT EXISTS {OFFSETS_TABLE} (
+        file_path TEXT PRIMARY KEY,
+        byte_offset INTEGER,
+        header BLOB,
+        rows_read INTEGER,
+        updated_at TEXT,
+        fingerprint TEXT
+    );
+    CREATE TABLE IF NOT EXISTS {LOG_TABLE} (
+        file_path TEXT,
+        rows_read INTEGER,
+        rows_labelled INTEGER,
+        arrived_at TEXT,
+        committed_at TEXT,
+        latency_seconds REAL
+    );
+    ''')
+    columns = {r[1] for r in conn.execute(f"PRAGMA table_info({OFFSETS_TABLE})")}
+    if "fingerprint" not in columns:
+        conn.execute(f"ALTER TABLE {OFFSETS_TABLE} ADD COLUMN fingerprint TEXT")
+
+
+def get_offset(conn, path):
+    row = conn.execute(
+        f"SELECT byte_offset, header, rows_read, fingerprint FROM {OFFSETS_TABLE} WHERE file_path = ?", (path,)
+    ).fetchone()
+    if not row:
+        return 0, None, 0, None
+    offset, header, rows_read, fingerprint = row
+    return offset, header, rows_read or 0, fingerprint
+
+
+def save_offset(conn, path, offset, header, rows_read):
+    conn.execute(
+        f"INSERT OR REPLACE INTO {OFFSETS_TABLE} "
+        "(file_path, byte_offset, header, rows_read, updated_at, fingerprint) VALUES (?, ?, ?, ?, ?, ?)",
+        (path, offset, header, rows_read, datetime.now().isoformat(timespec="seconds"),
+         file_fingerprint(path, offset)),
+    )
+
+
+# 🔑 Hash do início do arquivo (até o offset já lido, no máximo FINGERPRINT_BYTES)
+def file_fingerprint(path, offset):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read(min(offset, FINGERPRINT_BYTES))).hexdigest()
+
+
+# 🔄 O arquivo foi trocado por outro (nova exportação copiada por cima)?
+def file_replaced(path, offset, header, fingerprint):
+    if os.path.getsize(path) < offset:
+        return True
+    if fingerprint is not None:
+        return file_fingerprint(path, offset) != fingerprint
+    if header is not None:
+        with open(path, "rb") as f:
+            return f.readline() != header
+    return False
+
+
+# 📍 Último fim de registro completo (quebra de linha fora de aspas)
+# Linhas em branco sozinhas (ex.: a quebra que faltava no fim do arquivo) não formam um lote
+def last_record_boundary(data):
+    boundary = -1
+    position = 0
+    in_quotes = False
+    has_content = False
+    for line in data.split(b"\n")[:-1]:
+        if line.count(b'"') % 2:
+            in_quotes = not in_quotes
+        has_content = has_content or bool(line.strip())
+        position += len(line) + 1
+        if not in_quotes and has_content:
+            boundary = position
+    return boundary
+
+
+# 🧾 Trecho final sem quebra de linha: só é um registro se trouxer todas as colunas do cabeçalho
+def is_complete_tail(header, tail):
+    if not tail.strip() or tail.count(b'"') % 2:
+        return False
+    rows = list(csv.reader(io.StringIO((header + tail).decode("utf-8-sig", errors="replace"))))
+    return len(rows) == 2 and len(rows[1]) == len(rows[0])
+
+
+# 📥 Ler apenas os registros completos depois do offset salvo
+# Com idle=True (arquivo parado há IDLE_TIMEOUT), o último registro pode não ter quebra de linha
+def read_new_records(path, offset, header, idle=False):
+    with open(path, "rb") as f:
+        if header is None:
+            header = f.readline()
+            offset = max(offset, len(header))
+        f.seek(offset)
+        data = f.read()
+
+    end = max(last_record_boundary(data), 0)
+    if idle and is_complete_tail(header, data[end:]):
+        end = len(data)
+    if end == 0:
+        return header, b"", offset
+    return header, data[:end], offset + end
+
+
+# 🔄 Etapas incrementais: parse, filtro UE, tags, normalização e K-Means persistidos
+def process_batch(header, chunk, scaler, bundle):
+    raw = pd.read_csv(io.BytesIO(header + chunk), encoding="utf-8-sig",
+                      usecols=lambda c: c in loader.COLUMNS_TO_KEEP)
+    raw = loader.prepare_incidents(raw)
+
+    df = pre.filter_eu_countries(raw.copy())
+    df = pre.create_impact_tag(df)
+    df = pre.create_tags(df)
+    df = pre.create_composite_attributes(df)
+
+    # Lote sem incidentes da UE: só as linhas brutas e o offset são gravados
+    if df.empty:
+        return raw, df, df.copy()
+
+    df = pre.normalize_data(df, scaler=scaler)
+    labelled = df.copy()
+    model = bundle["model"]
+    labelled["Cluster"] = model.predict(labelled[bundle["features"]].astype(model.cluster_centers_.dtype))
+    labelled["Cluster_Description"] = labelled["Cluster"].map(bundle["descriptions"])
+    return raw, df, labelled
+
+
+# 💾 Inserir linhas só nas colunas que a tabela já tem
+def insert_rows(conn, table, df):
+    columns = [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+    if not columns or df.empty:
+        return 0
+    columns = [c for c in columns if c in df.columns]
+    values = df[columns].copy()
+    for col in values.columns[values.dtypes.map(pd.api.types.is_datetime64_any_dtype)]:
+        values[col] = values[col].dt.strftime("%Y-%m-%d %H:%M:%S")
+    values = values.astype(object).where(values.notna(), None)
+    quoted = ", ".join(f'"{c}"' for c in columns)
+    conn.executemany(
+        f"INSERT INTO {table} ({quoted}) VALUES ({', '.join('?' for _ in columns)})",
+        values.itertuples(index=False, name=None),
+    )
+    return len(values)
+
+
+# ⚡ Processar um arquivo novo/crescido numa única transação
+def process_file(conn, path, scaler, bundle):
+    offset, header, rows_read, fingerprint = get_offset(conn, path)
+    if file_replaced(path, offset, header, fingerprint):
+        print(f"⚠️ {os.path.basename(path)} foi substituído; relendo desde o início (IDs já carregados são ignorados).")
+        offset, header, rows_read = 0, None, 0
+    if os.path.getsize(path) == offset:
+        return 0
+
+    arrived_at = os.path.getmtime(path)
+    idle = time.time() - arrived_at >= IDLE_TIMEOUT
+    header, chunk, new_offset = read_new_records(path, offset, header, idle)
+    if not chunk:
+        return 0
+
+    raw, processed, labelled = process_batch(header, chunk, scaler, bundle)
+    rows_in_chunk = len(raw)
+    # Incidentes que já estão no banco (arquivo relido desde o início) não entram de novo
+    loaded = {r[0] for r in conn.execute(f"SELECT ID FROM {RAW_TABLE}")}
+    raw, processed, labelled = (d[~d["ID"].isin(loaded)] for d in (raw, processed, labelled))
+
+    committed_at = time.time()
+    with conn:
+        insert_rows(conn, RAW_TABLE, raw)
+        insert_rows(conn, PROCESSED_TABLE, processed)
+        insert_rows(conn, KMEANS_TABLE, labelled)
+        save_offset(conn, path, new_offset, header, rows_read + rows_in_chunk)
+        conn.execute(
+            f"INSERT INTO {LOG_TABLE} VALUES (?, ?, ?, ?, ?, ?)",
+            (path, rows_in_chunk, len(labelled),
+             datetime.fromtimestamp(arrived_at).isoformat(timespec="seconds"),
+             datetime.fromtimestamp(committed_at).isoformat(timespec="seconds"),
+             committed_at - arrived_at),
+        )
+
+    print(f"✅ {os.path.basename(path)}: {rows_in_chunk} linhas lidas, {len(raw)} novas, {len(labelled)} rotuladas "
+          f"(latência {committed_at - arrived_at:.2f} s desde a chegada).")
+    return len(raw)
+
+
+# 📌 Marcar os arquivos atuais como já carregados (eles vieram pelo pipeline completo)
+def mark_baseline(conn, paths):
+    with conn:
+        for path in paths:
+            with open(path, "rb") as f:
+                header = f.readline()
+            save_offset(conn, path, os.path.getsize(path), header, 0)
+    print(f"📌 {len(paths)} arquivos marcados como já processados.")
+
+
+def list_files():
+    return sorted(os.path.abspath(p) for p in glob.glob(os.path.join(WATCH_DIR, FILE_PATTERN)))
+
+
+# 🛡️ Sem offsets mas com incidentes no banco: os arquivos atuais já vieram pelo pipeline completo
+def ensure_baseline(conn):
+    tracked = conn.execute(f"SELECT COUNT(*) FROM {OFFSETS_TABLE}").fetchone()[0]
+    has_table = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (RAW_TABLE,)).fetchone()
+    if tracked or not has_table or not conn.execute(f"SELECT 1 FROM {RAW_TABLE} LIMIT 1").fetchone():
+        return
+    print(f"⚠️ '{OFFSETS_TABLE}' vazia mas '{RAW_TABLE}' já tem incidentes: aplicando --baseline automaticamente.")
+    mark_baseline(conn, list_files())
+
+
+def load_artifacts():
+    if not os.path.exists(pre.SCALER_PATH) or not os.path.exists(KMEANS_MODEL_PATH):
+        raise FileNotFoundError("Scaler/modelo não encontrados. Rode 2_preprocess_data.py e 4.1_kmeans.py antes.")
+    return joblib.load(pre.SCALER_PATH), joblib.load(KMEANS_MODEL_PATH)
+
+
+# 🔁 Laço de micro-lotes
+def watch(interval=POLL_INTERVAL, once=False):
+    scaler, bundle = load_artifacts()
+    conn = sqlite3.connect(DB_PATH)
+    create_control_tables(conn)
+    ensure_baseline(conn)
+    print(f"👀 Observando {os.path.abspath(WATCH_DIR)} ({FILE_PATTERN}) a cada {interval:.0f} s...")
+    try:
+        while True:
+            for path in list_files():
+                try:
+                    process_file(conn, path, scaler, bundle)
+                except Exception as e:
+                    print(f"❌ ERRO ao processar {os.path.basename(path)}: {e}")
+            if once:
+                break
+            time.sleep(interval)
+    finally:
+        conn.close()
+
+
+# 🚀 Execução principal
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rotula continuamente novos incidentes que chegam em data/.")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL)
+    parser.add_argument("--once", action="store_true", help="processa o que houver e sai")
+    parser.add_argument("--baseline", action="store_true",
+                        help="marca os arquivos atuais como já carregados e sai")
+    args = parser.parse_args()
+
+    if args.baseline:
+        conn = sqlite3.connect(DB_PATH)
+        create_control_tables(conn)
+        mark_baseline(conn, list_files())
+        conn.close()
+    else:
+        try:
+            watch(args.interval, args.once)
+        except KeyboardInterrupt:
+            print("\n🛑 Observação encerrada.")